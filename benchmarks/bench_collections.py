@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from carton.collections import collate, flatten_dict
+
+
+def bench_flatten_dict(benchmark, nested_dict):
+    benchmark(flatten_dict, nested_dict)
+
+
+def bench_collate(benchmark, records):
+    benchmark(collate, records)
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import pytest
+
+from carton.data import describe_series, split
+
+
+def bench_describe_series(benchmark, series):
+    benchmark(describe_series, series)
+
+
+def bench_split(benchmark, series):
+    pytest.importorskip("sklearn")
+
+    benchmark(split, series, random_state=0)
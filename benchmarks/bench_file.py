@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import collections
+
+import pytest
+from conftest import NUM_WORKERS
+
+from carton.file import (
+    chunkify,
+    dedup_file,
+    iter_file_groups,
+    iter_lines,
+    map_file_groups,
+    map_lines,
+    map_text,
+    read_lines,
+    readlines,
+    sort_file,
+)
+
+
+def _count(filename, start, end):
+    return [sum(1 for _ in readlines(filename, start, end))]
+
+
+def bench_chunkify(benchmark, text_file):
+    benchmark(lambda: collections.deque(chunkify(text_file), maxlen=0))
+
+
+def bench_read_lines(benchmark, text_file):
+    benchmark(lambda: collections.deque(read_lines(text_file), maxlen=0))
+
+
+def bench_iter_lines(benchmark, text_file):
+    benchmark(lambda: collections.deque(iter_lines(text_file), maxlen=0))
+
+
+@pytest.mark.parametrize("backend", ["process", "thread", "serial"])
+def bench_map_lines(benchmark, text_file, backend):
+    benchmark.pedantic(
+        lambda: collections.deque(
+            map_lines(text_file, len, num_workers=NUM_WORKERS, backend=backend),
+            maxlen=0,
+        ),
+        rounds=3,
+    )
+
+
+@pytest.mark.parametrize("backend", ["process", "thread", "serial"])
+def bench_map_text(benchmark, text_file, backend):
+    benchmark.pedantic(
+        lambda: sum(
+            map_text(text_file, _count, num_workers=NUM_WORKERS, backend=backend)
+        ),
+        rounds=3,
+    )
+
+
+def bench_iter_file_groups(benchmark, file_tree):
+    benchmark(lambda: collections.deque(iter_file_groups(file_tree, ["wav", "txt"])))
+
+
+@pytest.mark.parametrize("backend", ["process", "thread", "serial"])
+def bench_map_file_groups(benchmark, file_tree, backend):
+    benchmark.pedantic(
+        lambda: collections.deque(
+            map_file_groups(
+                file_tree, ["wav", "txt"], len, num_workers=NUM_WORKERS, backend=backend
+            ),
+            maxlen=0,
+        ),
+        rounds=3,
+    )
+
+
+def bench_sort_file(benchmark, text_file, tmp_path):
+    output = str(tmp_path / "sorted.txt")
+    benchmark.pedantic(
+        sort_file,
+        args=(text_file, output),
+        kwargs={"num_workers": NUM_WORKERS, "chunk_size": 8 * 1024 * 1024},
+        rounds=3,
+    )
+
+
+def bench_dedup_file(benchmark, text_file, tmp_path):
+    output = str(tmp_path / "dedup.txt")
+    benchmark.pedantic(
+        dedup_file,
+        args=(text_file, output),
+        kwargs={"num_workers": NUM_WORKERS, "chunk_size": 8 * 1024 * 1024},
+        rounds=3,
+    )
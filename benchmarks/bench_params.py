@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import pytest
+
+from carton.params import Params, clear_cache
+
+
+@pytest.fixture(scope="module")
+def params(nested_dict):
+    return Params(nested_dict)
+
+
+@pytest.fixture(scope="module", params=["json", "yaml", "toml"])
+def config_file(request, tmp_path_factory, params):
+    filename = str(tmp_path_factory.mktemp("params") / f"params.{request.param}")
+    getattr(params, f"to_{request.param}")(filename)
+
+    return request.param, filename
+
+
+def bench_params_load(benchmark, config_file):
+    format_, filename = config_file
+    benchmark(getattr(Params, f"from_{format_}"), filename)
+
+
+def bench_params_load_cached(benchmark, config_file):
+    format_, filename = config_file
+    clear_cache()
+    benchmark(getattr(Params, f"from_{format_}"), filename, cache=True)
+
+
+def bench_params_copy(benchmark, params):
+    benchmark(params.copy)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import os
+import random
+import string
+
+import pytest
+
+# Scale every generated fixture, e.g. `CARTON_BENCH_SCALE=64` for a 2 GB text file.
+SCALE = float(os.environ.get("CARTON_BENCH_SCALE", "1"))
+
+NUM_WORKERS = int(os.environ.get("CARTON_BENCH_WORKERS", os.cpu_count() or 1))
+
+
+def _scaled(n):
+    return max(1, int(n * SCALE))
+
+
+@pytest.fixture(scope="session")
+def rng():
+    return random.Random(0)
+
+
+@pytest.fixture(scope="session")
+def text_file(tmp_path_factory, rng):
+    filename = tmp_path_factory.mktemp("text") / "lines.txt"
+    size = _scaled(32 * 1024 * 1024)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=8)) for _ in range(1024)]
+    with open(filename, mode="w") as f:
+        written = 0
+        while written < size:
+            line = " ".join(rng.choices(words, k=rng.randint(1, 16))) + "\n"
+            written += f.write(line)
+
+    return str(filename)
+
+
+@pytest.fixture(scope="session")
+def file_tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("tree")
+    for i in range(_scaled(2000)):
+        dirname = root / f"d{i % 16}" / f"e{i % 7}"
+        dirname.mkdir(parents=True, exist_ok=True)
+        for ext in ("wav", "txt"):
+            (dirname / f"f{i}.{ext}").touch()
+
+    return str(root)
+
+
+@pytest.fixture(scope="session")
+def nested_dict(rng):
+    def _build(depth, width):
+        if depth == 0:
+            return rng.random()
+
+        return {f"k{i}": _build(depth - 1, width) for i in range(width)}
+
+    return _build(depth=6, width=max(2, int(6 * SCALE ** (1 / 6))))
+
+
+@pytest.fixture(scope="session")
+def records(rng):
+    return [
+        {"a": rng.random(), "b": rng.randint(0, 100), "c": "x"}
+        for _ in range(_scaled(200_000))
+    ]
+
+
+@pytest.fixture(scope="session")
+def series(rng):
+    return [rng.randint(0, 1000) for _ in range(_scaled(1_000_000))]
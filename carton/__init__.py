@@ -1,18 +1,33 @@
 # -*- coding: utf-8 -*-
 
+import importlib
+
 __all__ = [
-    "collections.py",
-    "data.py",
-    "datetime.py",
-    "file.py",
-    "gallary.py",
-    "io.py",
-    "logger.py",
-    "palette.py",
-    "params.py",
-    "random.py",
-    "utils.py",
+    "cache",
+    "collections",
+    "data",
+    "datetime",
+    "file",
+    "gallary",
+    "io",
+    "logger",
+    "palette",
+    "params",
+    "profiling",
+    "random",
+    "utils",
 ]
 
 
 __version__ = "0.3.8"
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
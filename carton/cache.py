@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import warnings
+from collections.abc import Iterable, Iterator
+from typing import Any, Callable, Optional, TypeVar, Union
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_missing = object()
+
+
+def default_cache_dir() -> str:
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+
+    return os.path.abspath(os.path.expanduser(os.path.join(root, "carton")))
+
+
+def fingerprint(
+    filename: Union[str, os.PathLike], content: bool = False
+) -> Union[tuple[str, int, int], str]:
+    filename = os.path.abspath(os.fspath(filename))
+    if not content:
+        stat = os.stat(filename)
+        return filename, stat.st_size, stat.st_mtime_ns
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filename, mode="rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    # Set iteration order depends on the per-process string hash seed.
+    if isinstance(value, (set, frozenset)):
+        items = [_canonical(x) for x in value]
+        items.sort(key=lambda x: pickle.dumps(x, protocol=4))
+        return type(value).__name__, items
+    if isinstance(value, list):
+        return [_canonical(x) for x in value]
+    if isinstance(value, tuple):
+        return tuple(_canonical(x) for x in value)
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+
+    return value
+
+
+class DiskCache(object):
+    def __init__(
+        self,
+        dirname: Optional[Union[str, os.PathLike]] = None,
+        max_size: Optional[int] = None,
+        mmap: bool = True,
+    ) -> None:
+        if dirname is None:
+            dirname = default_cache_dir()
+        self.dirname = os.path.abspath(os.path.expanduser(os.fspath(dirname)))
+        self.max_size = max_size
+        self.mmap = mmap
+        os.makedirs(self.dirname, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.dirname, f"{key}{ext}")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        for ext in (".npy", ".pkl"):
+            path = self._path(key, ext)
+            try:
+                if ext == ".npy":
+                    if not os.path.exists(path):
+                        continue
+
+                    # pylint: disable=import-outside-toplevel
+                    import numpy as np
+
+                    value = np.load(path, mmap_mode="r" if self.mmap else None)
+                else:
+                    with open(path, mode="rb") as f:
+                        value = pickle.load(f)
+            except FileNotFoundError:
+                continue
+
+            # The modification time doubles as the LRU timestamp.
+            with contextlib.suppress(OSError):
+                os.utime(path)
+
+            return value
+
+        return default
+
+    def set(self, key: str, value: Any) -> None:
+        numpy = sys.modules.get("numpy")
+        array = (
+            numpy is not None
+            and isinstance(value, numpy.ndarray)
+            and not value.dtype.hasobject
+        )
+        ext = ".npy" if array else ".pkl"
+
+        fd, tmp = tempfile.mkstemp(dir=self.dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode="wb") as f:
+                if array:
+                    numpy.save(f, value, allow_pickle=False)
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key, ext))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+
+        self.evict()
+
+    def __contains__(self, key: str) -> bool:
+        return any(os.path.exists(self._path(key, ext)) for ext in (".npy", ".pkl"))
+
+    @contextlib.contextmanager
+    def _lock(self) -> Iterator[None]:
+        try:
+            # pylint: disable=import-outside-toplevel
+            import fcntl
+        except ModuleNotFoundError:
+            yield
+            return
+
+        with open(os.path.join(self.dirname, ".lock"), mode="a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.dirname):
+            if not entry.name.endswith((".npy", ".pkl")):
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                stat = entry.stat()
+                entries += [(stat.st_mtime_ns, stat.st_size, entry.path)]
+
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        if not self.max_size:
+            return
+
+        with self._lock():
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_size:
+                    break
+
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock():
+            for *_, path in self._entries():
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+
+
+def memoize(
+    cache: Optional[Union[DiskCache, str, os.PathLike]] = None,
+    files: Iterable[str] = (),
+    content: bool = False,
+    max_size: Optional[int] = None,
+) -> Callable[[F], F]:
+    if not isinstance(cache, DiskCache):
+        cache = DiskCache(cache, max_size=max_size)
+    elif max_size is not None:
+        raise ValueError("Param `max_size` should be set on the `DiskCache` instead")
+    files = list(files)
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        identity = f"{fn.__module__}.{fn.__qualname__}"
+
+        def cache_key(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            fingerprints = []
+            for name in files:
+                value = bound.arguments.get(name)
+                if value is None:
+                    continue
+
+                if isinstance(value, (str, os.PathLike)):
+                    value = [value]
+                fingerprints += [(name, [fingerprint(x, content) for x in value])]
+
+            data = _canonical(
+                (identity, bound.args, sorted(bound.kwargs.items()), fingerprints)
+            )
+            payload = pickle.dumps(data, protocol=4)
+
+            return hashlib.sha256(payload).hexdigest()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                key = cache_key(*args, **kwargs)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                warnings.warn(f"Calling {identity} uncached: {e!s}")
+                return fn(*args, **kwargs)
+
+            value = cache.get(key, _missing)
+            if value is _missing:
+                value = fn(*args, **kwargs)
+                try:
+                    cache.set(key, value)
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    warnings.warn(f"Result of {identity} is not cached: {e!s}")
+
+            return value
+
+        wrapper.cache = cache  # type: ignore
+        wrapper.cache_key = cache_key  # type: ignore
+
+        return wrapper
+
+    return decorator
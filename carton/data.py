@@ -4,14 +4,18 @@ from __future__ import annotations
 
 import statistics
 from collections.abc import Iterable, Sequence
-from typing import Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
-import numpy as np
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def describe_series(
     s: Sequence, r: int = 2, qs: Optional[Sequence[float]] = None
 ) -> dict:
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
     if not qs:
         qs = [10, 25, 50, 75, 90, 95, 99, 99.9, 99.99]
 
@@ -31,6 +35,39 @@ def describe_series(
     return info
 
 
+def lttb(x: Sequence[float], y: Sequence[float], num_points: int) -> "np.ndarray":
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    size = len(x)
+    if num_points >= size or num_points < 3:
+        return np.arange(size)
+
+    # Largest-Triangle-Three-Buckets: keep the endpoints and, per bucket, the
+    # point forming the largest triangle with the previous pick and the mean
+    # of the next bucket.
+    edges = np.linspace(1, size - 1, num_points - 1).astype(np.int64)
+    edges = np.append(edges, size)
+    indices = np.empty(num_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, size - 1
+
+    a = 0
+    for i in range(num_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_x = x[stop : edges[i + 2]].mean()
+        next_y = y[stop : edges[i + 2]].mean()
+        areas = np.abs(
+            (x[a] - next_x) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+
 def split(
     *data: Iterable[Sequence],
     val_size: float = 0.1,
@@ -1,21 +1,108 @@
 # -*- coding: utf-8 -*-
 
+from __future__ import annotations
+
+import contextlib
 import datetime
+import functools
 import numbers
-from typing import NewType, Optional, Union
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, NewType, Optional, Union
 
-import dateutil
-import dateutil.parser
+if TYPE_CHECKING:
+    import numpy as np
 
 DateTime = NewType("DateTime", Union[str, numbers.Real, datetime.datetime])
 
+DATETIME_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S.%f",
+    "%Y%m%d %H:%M:%S",
+    "%Y%m%d%H%M%S",
+    "%d/%b/%Y:%H:%M:%S %z",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%Y%m%d",
+]
+
+
+def _strptime(string, format_):
+    # strptime matches leniently (e.g. "%H%M%S" accepts "0304"), so only
+    # accept results that format back to the original string.
+    try:
+        dt = datetime.datetime.strptime(string, format_)
+    except ValueError:
+        return None
+
+    return dt if dt.strftime(format_) == string else None
+
+
+def infer_datetime_format(
+    strings: Iterable[str], formats: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    if formats is None:
+        formats = DATETIME_FORMATS
+
+    formats = list(formats)
+    for string in strings:
+        if not string:
+            continue
+
+        for format_ in formats:
+            if _strptime(string, format_) is not None:
+                return format_
+
+        return None
+
+    return None
+
+
+@functools.lru_cache(maxsize=65536)
+def parse_datetime(string: str) -> datetime.datetime:
+    with contextlib.suppress(ValueError):
+        return datetime.datetime.fromisoformat(string)
+
+    format_ = infer_datetime_format([string])
+    if format_ is not None:
+        return datetime.datetime.strptime(string, format_)
+
+    # pylint: disable=import-outside-toplevel
+    import dateutil.parser
+
+    return dateutil.parser.parse(string)
+
+
+#  pylint: disable=redefined-builtin
+def parse_datetimes(
+    strings: Iterable[str], format: Optional[str] = None
+) -> list[datetime.datetime]:
+    strings = list(strings)
+    if format is None:
+        format = infer_datetime_format(strings[:10])
+
+    if format is None:
+        return [parse_datetime(x) for x in strings]
+
+    parsed = []
+    for string in strings:
+        dt = _strptime(string, format)
+        parsed += [dt if dt is not None else parse_datetime(string)]
+
+    return parsed
+
 
 def ensure_datetime(dt: DateTime) -> datetime.datetime:
     if isinstance(dt, datetime.datetime):
         return dt
 
     if isinstance(dt, str):
-        return dateutil.parser.parse(dt)
+        return parse_datetime(dt)
 
     if isinstance(dt, numbers.Real):
         return datetime.datetime.fromtimestamp(dt)
@@ -23,15 +110,26 @@ def ensure_datetime(dt: DateTime) -> datetime.datetime:
     raise ValueError(f"Invalid datetime type: {type(dt)}")
 
 
+@functools.lru_cache(maxsize=None)
+def get_timezone(timezone: Optional[str] = None) -> Optional[datetime.tzinfo]:
+    # pylint: disable=import-outside-toplevel
+    import dateutil.tz
+
+    if timezone is None:
+        return dateutil.tz.tzlocal()
+
+    return dateutil.tz.gettz(timezone)
+
+
 def utcstr_to_datetime(
-    string: str, timezone: Optional[Union[datetime.tzinfo, str]] = dateutil.tz.tzlocal()
+    string: str, timezone: Optional[Union[datetime.tzinfo, str]] = None
 ) -> datetime.datetime:
-    if isinstance(timezone, str):
-        timezone = dateutil.tz.gettz(timezone)
+    if timezone is None or isinstance(timezone, str):
+        timezone = get_timezone(timezone)
 
     return (
-        dateutil.parser.parse(string)
-        .replace(tzinfo=dateutil.tz.tzutc())
+        parse_datetime(string)
+        .replace(tzinfo=datetime.timezone.utc)
         .astimezone(timezone)
         .replace(tzinfo=None)
     )
@@ -49,6 +147,174 @@ def timestamp_to_datetime(timestamp: float) -> datetime.datetime:
     return timestamp10_to_datetime(timestamp)
 
 
+def _utcoffsets_ms(ms, timezone):
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    if isinstance(timezone, datetime.timezone):
+        offset = timezone.utcoffset(None)
+
+        return np.full_like(ms, offset // datetime.timedelta(milliseconds=1))
+
+    # Offsets only change at transitions, so resolve them once per 15 minutes,
+    # and only per day where no transition happens in between.
+    bucket, day = 15 * 60 * 1000, 96
+
+    def _offsets(keys):
+        return np.fromiter(
+            (
+                datetime.datetime.fromtimestamp(int(x) * bucket / 1000, tz=timezone)
+                .utcoffset()
+                .total_seconds()
+                * 1000
+                for x in keys
+            ),
+            dtype=np.int64,
+            count=len(keys),
+        )
+
+    keys = ms // bucket
+    low, high = int(keys.min()), int(keys.max())
+    if high - low >= keys.size:
+        buckets, inverse = np.unique(keys, return_inverse=True)
+
+        return _offsets(buckets)[inverse.reshape(ms.shape)]
+
+    size = high - low + 1
+    # At least two endpoints, so a single bucket still forms one day.
+    days = np.arange(low, high + 2 * day, day)
+    day_offsets = _offsets(days)
+    offsets = np.repeat(day_offsets[:-1], day)[:size]
+    for i in np.flatnonzero(day_offsets[:-1] != day_offsets[1:]):
+        start = i * day
+        stop = min(start + day, size)
+        offsets[start:stop] = _offsets(range(low + start, low + stop))
+
+    return offsets[keys - low]
+
+
+def _numeric_strings(values):
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    if values.dtype.kind not in "US" or values.size == 0:
+        return None
+
+    if np.char.isdigit(values).all():
+        return values.astype(np.int64)
+
+    with contextlib.suppress(ValueError):
+        return values.astype(np.float64)
+
+    return None
+
+
+def _has_utcoffset(values):
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    # Date parts only contain "-" before index 10, so a later "+"/"-" or a
+    # trailing "Z" marks an offset.
+    return bool(
+        (
+            (np.char.find(values, "+") >= 0)
+            | (np.char.rfind(values, "-") >= 10)
+            | np.char.endswith(values, "Z")
+        ).any()
+    )
+
+
+def timestamp_to_datetime64(
+    timestamps: Iterable[float],
+    unit: Optional[str] = None,
+    timezone: Optional[Union[datetime.tzinfo, str]] = None,
+) -> "np.ndarray":
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    units = {None, "s", "ms"}
+    if unit not in units:
+        raise ValueError(f"Param `unit` should be in {units}")
+
+    timestamps = np.asarray(timestamps)
+    if timestamps.size == 0:
+        return timestamps.astype("datetime64[ms]")
+
+    numeric = _numeric_strings(timestamps)
+    if numeric is not None:
+        timestamps = numeric
+
+    if unit is None:
+        unit = "ms" if np.abs(timestamps).max() >= 1e11 else "s"
+
+    if unit == "s":
+        ms = np.round(timestamps * 1000).astype(np.int64)
+    else:
+        ms = np.round(timestamps).astype(np.int64)
+
+    if timezone is None or isinstance(timezone, str):
+        timezone = get_timezone(timezone)
+
+    return (ms + _utcoffsets_ms(ms, timezone)).astype("datetime64[ms]")
+
+
+def timestamp13_to_datetime64(
+    timestamps: Iterable[float],
+    timezone: Optional[Union[datetime.tzinfo, str]] = None,
+) -> "np.ndarray":
+    return timestamp_to_datetime64(timestamps, unit="ms", timezone=timezone)
+
+
+def timestamp10_to_datetime64(
+    timestamps: Iterable[float],
+    timezone: Optional[Union[datetime.tzinfo, str]] = None,
+) -> "np.ndarray":
+    return timestamp_to_datetime64(timestamps, unit="s", timezone=timezone)
+
+
+def ensure_datetime64(
+    values: Iterable[DateTime],
+    timezone: Optional[Union[datetime.tzinfo, str]] = None,
+) -> "np.ndarray":
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[ms]")
+
+    if values.dtype.kind in "iuf":
+        return timestamp_to_datetime64(values, timezone=timezone)
+
+    if values.dtype.kind == "U" and values.size:
+        # Epoch strings have at least 9 digits; shorter ones like "2020" or
+        # "20200102" are dates.
+        if np.char.isdigit(values).all() and np.char.str_len(values).min() >= 9:
+            return timestamp_to_datetime64(values.astype(np.int64), timezone=timezone)
+
+        # NumPy's parser only handles ISO dates ("2020-01-02"), reads compact
+        # ones as years, and converts offsets to UTC ignoring `timezone`.
+        if (np.char.find(values, "-") == 4).all() and not _has_utcoffset(values):
+            with contextlib.suppress(ValueError):
+                return values.astype("datetime64[ms]")
+
+    if timezone is None or isinstance(timezone, str):
+        timezone = get_timezone(timezone)
+
+    def _naive(dt):
+        if dt.tzinfo is None:
+            return dt
+
+        return dt.astimezone(timezone).replace(tzinfo=None)
+
+    if values.dtype.kind == "U":
+        datetimes = parse_datetimes(values.tolist())
+    else:
+        datetimes = [ensure_datetime(x) for x in values.tolist()]
+
+    return np.array([_naive(x) for x in datetimes], dtype="datetime64[ms]")
+
+
 def date(
     offset: int = 0, return_date: bool = False
 ) -> Union[datetime.datetime, datetime.date]:
@@ -2,34 +2,101 @@
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import csv
+import functools
 import glob
+import heapq
+import io
 import itertools
+import json
 import math
 import multiprocessing
+import operator
 import os
-from collections.abc import Callable, Generator, Iterable
+import sys
+import tempfile
+import zlib
+from collections.abc import Callable, Generator, Hashable, Iterable
 from typing import Any, Optional, Union
 
 
+_missing = object()
+
+
 def normalize_path(p: str) -> str:
     return os.path.abspath(os.path.expanduser(p))
 
 
+def normalize_paths(paths: Iterable[str]) -> list[str]:
+    return [_normalize(p) for p in paths]
+
+
+def _normalize(p):
+    # Relative paths depend on the working directory and are not cached.
+    if os.path.isabs(p):
+        return _normalize_absolute(p)
+
+    return _Path(normalize_path(p))
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalize_absolute(p):
+    return _Path(normalize_path(p))
+
+
+@functools.lru_cache(maxsize=65536)
+def _join(a, b):
+    return _Path(os.path.join(a, b))
+
+
+@functools.lru_cache(maxsize=65536)
+def _split(p):
+    stem, ext = os.path.splitext(os.path.basename(p))
+    return stem, ext
+
+
 class _Path(str):
+    __slots__ = ()
+
     def __new__(cls, value):
         return super().__new__(cls, (value))
 
     def __truediv__(self, path):
-        return _Path(os.path.join(self, path))
+        return _join(self, path)
 
     def norm(self):
-        return self.__class__(normalize_path(self))
+        return _normalize(self)
+
+    @property
+    def stem(self):
+        return _split(self)[0]
+
+    @property
+    def ext(self):
+        return _split(self)[1]
 
 
 def path(root: str) -> _Path:
     return _Path(root)
 
 
+def join_paths(root: str, names: Iterable[str]) -> list[_Path]:
+    return [_join(root, name) for name in names]
+
+
+def _file_group_exts(exts, missing):
+    missings = {"error", "ignore"}
+    if missing not in missings:
+        raise ValueError(f"Param `missing` should be in {missings}")
+
+    if isinstance(exts, str):
+        exts = [exts]
+
+    return {f'.{ext.lstrip(".")}' for ext in exts}
+
+
 def iter_file_groups(
     dirname: str,
     exts: Union[str, Iterable[str]],
@@ -38,31 +105,27 @@ def iter_file_groups(
 ) -> Union[
     Iterable[str], Iterable[tuple[str, ...]], tuple[str, Iterable[tuple[str, ...]]]
 ]:
-    def _format_ext(ext):
-        return f'.{ext.lstrip(".")}'
-
     def _iter_files(dirname):
+        # Split each name once and relativize each directory once.
         for dirpath, _, filenames in os.walk(dirname):
+            reldir = os.path.relpath(dirpath, dirname)
             for filename in filenames:
-                if os.path.splitext(filename)[1] in exts:
-                    yield os.path.join(dirpath, filename)
-
-    missings = {"error", "ignore"}
-    if missing not in missings:
-        raise ValueError(f"Param `missing` should be in {missings}")
+                stem, ext = os.path.splitext(filename)
+                if ext in exts:
+                    key = stem if reldir == os.curdir else os.path.join(reldir, stem)
+                    yield key, ext, os.path.join(dirpath, filename)
 
     if isinstance(exts, str):
-        return glob.iglob(
-            os.path.join(dirname, f"**/*{_format_ext(exts)}"), recursive=True
-        )
+        (ext,) = _file_group_exts(exts, missing)
+        return glob.iglob(os.path.join(dirname, f"**/*{ext}"), recursive=True)
 
-    exts = {*map(_format_ext, exts)}
+    exts = _file_group_exts(exts, missing)
     num_exts = len(exts)
     files = _iter_files(dirname)
-    for key, group in itertools.groupby(
-        sorted(files), key=lambda x: os.path.splitext(os.path.relpath(x, dirname))[0]
-    ):
-        sorted_group = sorted(group, key=lambda x: os.path.splitext(x)[1])
+    # Sorted by path, not key, to keep the order ("a-b" before "a") stable.
+    files = sorted(files, key=operator.itemgetter(2))
+    for key, group in itertools.groupby(files, key=operator.itemgetter(0)):
+        sorted_group = [filename for *_, filename in group]
         if len(sorted_group) != num_exts and missing == "error":
             raise RuntimeError(f"Missing files: {key}.{exts}")
 
@@ -126,9 +189,109 @@ def _iter_line_wrapper(filename, fn, start, end):
     return [fn(line) for line in readlines(filename, start, end)]
 
 
+def _pread_line_wrapper(fd, fn, start, end):
+    # `os.pread` does not move a shared file position, so threads can share `fd`.
+    # One call returns at most 0x7ffff000 bytes on Linux, so read until `end`.
+    blocks = []
+    while start < end:
+        block = os.pread(fd, end - start, start)
+        if not block:
+            break
+        blocks += [block]
+        start += len(block)
+    data = b"".join(blocks)
+
+    return [fn(line) for line in io.TextIOWrapper(io.BytesIO(data))]
+
+
+def _seeded_wrapper(seed, chunk_idx, fn, *args):
+    # pylint: disable=import-outside-toplevel
+    from carton.random import seed_chunk
+
+    seed_chunk(seed, chunk_idx)
+
+    return fn(*args)
+
+
+def _seed_chunks(fn, args, seed, backend):
+    if seed is None:
+        return fn, args
+
+    if backend == "thread":
+        raise ValueError("Param `seed` is not supported by the thread backend")
+
+    return _seeded_wrapper, [(seed, i, fn, *x) for i, x in enumerate(args)]
+
+
+def _resolve_backend(backend, num_workers):
+    backends = {"process", "thread", "serial", "auto"}
+    if backend not in backends:
+        raise ValueError(f"Param `backend` should be in {backends}")
+
+    if backend != "auto":
+        return backend
+
+    if num_workers <= 1:
+        return "serial"
+
+    # Free-threaded builds run threads in parallel without the GIL.
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    return "process" if gil_enabled else "thread"
+
+
+def _starmap(fn, args, backend, num_workers, initializer=None, initargs=()):
+    if backend == "serial":
+        if initializer is not None:
+            initializer(*initargs)
+
+        if fn is not _seeded_wrapper:
+            return [fn(*x) for x in args]
+
+        # Chunks reseed this process, so restore the caller's state afterwards.
+        # pylint: disable=import-outside-toplevel
+        from carton.random import get_state, set_state
+
+        states = get_state()
+        try:
+            return [fn(*x) for x in args]
+        finally:
+            set_state(states)
+
+    if backend == "thread":
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_workers, initializer=initializer, initargs=initargs
+        ) as executor:
+            return list(executor.map(lambda x: fn(*x), args))
+
+    with multiprocessing.Pool(
+        processes=num_workers, initializer=initializer, initargs=initargs
+    ) as p:
+        results = p.starmap(fn, args)
+        # Let workers exit normally so finalizers, e.g. queued logs, still run.
+        p.close()
+        p.join()
+
+    return results
+
+
 def chunkify(
-    filename: Union[str, os.PathLike], chunk_size: int = 1024 * 1024
+    filename: Union[str, os.PathLike],
+    chunk_size: int = 1024 * 1024,
+    format: str = "lines",  # pylint: disable=redefined-builtin
+    record_size: Optional[int] = None,
 ) -> Generator[tuple[int, int], None, None]:
+    if format == "csv":
+        yield from _chunkify_csv(filename, chunk_size)
+        return
+
+    if format == "fixed":
+        yield from _chunkify_fixed(filename, chunk_size, record_size)
+        return
+
+    if format not in {"lines", "jsonl"}:
+        raise ValueError(f"Unsupported record format: {format!r}")
+
     start = 0
     size = os.path.getsize(filename)
     with open(filename, mode="rb") as f:
@@ -143,6 +306,70 @@ def chunkify(
             start = end
 
 
+def _chunkify_fixed(filename, chunk_size, record_size):
+    if not record_size or record_size <= 0:
+        raise ValueError("Param `record_size` is required for fixed-width records")
+
+    size = os.path.getsize(filename)
+    if size % record_size:
+        raise ValueError(
+            f"File size {size} is not a multiple of `record_size` {record_size}"
+        )
+
+    chunk_size = max(1, chunk_size // record_size) * record_size
+    for start in range(0, size, chunk_size):
+        yield start, min(start + chunk_size, size)
+
+
+def _count(block, sub, *args):
+    return block.count(sub, *args) if sub else 0
+
+
+def _chunkify_csv(
+    filename, chunk_size, start=0, block_size=1024 * 1024, quotechar=b'"'
+):
+    # A newline ends a record only outside quotes, i.e. after an even number
+    # of quote characters since the previous record boundary; escaped quotes
+    # ("") keep the parity. An empty `quotechar` disables quoting.
+    size = os.path.getsize(filename)
+    quotes = 0
+    target = start + chunk_size
+    with open(filename, mode="rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < size:
+            block = f.read(block_size)
+            if not block:
+                break
+
+            i = 0
+            while True:
+                if target > pos + len(block):
+                    quotes += _count(block, quotechar, i)
+                    break
+
+                if target > pos + i:
+                    quotes += _count(block, quotechar, i, target - pos)
+                    i = target - pos
+
+                j = block.find(b"\n", i)
+                if j < 0:
+                    quotes += _count(block, quotechar, i)
+                    break
+
+                quotes += _count(block, quotechar, i, j)
+                i = j + 1
+                if quotes % 2 == 0:
+                    end = pos + i
+                    yield start, end
+                    start, target = end, end + chunk_size
+
+            pos += len(block)
+
+    if start < size:
+        yield start, size
+
+
 def readlines(
     filename: Union[str, os.PathLike],
     start: Optional[int] = None,
@@ -165,12 +392,17 @@ def map_text(
     fn: Callable[[str, int, int], Any],
     num_workers: int = multiprocessing.cpu_count(),
     chunk_size: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+    backend: str = "process",
+    seed: Optional[int] = None,
 ) -> Iterable:
+    backend = _resolve_backend(backend, num_workers)
     args = _get_chunkified_args(
         filename, num_workers=num_workers, chunk_size=chunk_size
     )
-    with multiprocessing.Pool(processes=num_workers) as p:
-        data = p.starmap(fn, args)
+    fn, args = _seed_chunks(fn, args, seed, backend)
+    data = _starmap(fn, args, backend, num_workers, initializer, initargs)
 
     return itertools.chain.from_iterable(data)
 
@@ -180,11 +412,402 @@ def map_lines(
     fn: Callable[[str], Any],
     num_workers: int = multiprocessing.cpu_count(),
     chunk_size: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+    backend: str = "process",
+    seed: Optional[int] = None,
 ) -> Iterable:
+    backend = _resolve_backend(backend, num_workers)
     args = _get_chunkified_args(
         filename, fn, num_workers=num_workers, chunk_size=chunk_size
     )
-    with multiprocessing.Pool(processes=num_workers) as p:
-        data = p.starmap(_iter_line_wrapper, args)
+    if backend != "thread" or not hasattr(os, "pread"):
+        wrapper, args = _seed_chunks(_iter_line_wrapper, args, seed, backend)
+        data = _starmap(wrapper, args, backend, num_workers, initializer, initargs)
+
+        return itertools.chain.from_iterable(data)
+
+    if seed is not None:
+        raise ValueError("Param `seed` is not supported by the thread backend")
+
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        args = [(fd, *x) for _, *x in args]
+        data = _starmap(
+            _pread_line_wrapper, args, backend, num_workers, initializer, initargs
+        )
+    finally:
+        os.close(fd)
+
+    return itertools.chain.from_iterable(data)
+
+
+def _read_range(filename, start, end):
+    with open(filename, mode="rb") as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def _csv_quotechar(encoding, fmtparams):
+    dialect = csv.reader(io.StringIO(), **fmtparams).dialect
+    if dialect.escapechar is not None or not dialect.doublequote:
+        raise ValueError(
+            "Parallel CSV chunking requires `doublequote=True` and no `escapechar`"
+        )
+
+    if dialect.quoting == csv.QUOTE_NONE or not dialect.quotechar:
+        return b""
+
+    return dialect.quotechar.encode(encoding or "utf-8")
+
+
+def _csv_record_wrapper(filename, fn, header, encoding, fmtparams, start, end):
+    text = io.TextIOWrapper(
+        io.BytesIO(_read_range(filename, start, end)), encoding=encoding, newline=""
+    )
+    if header is not None:
+        reader = csv.DictReader(text, fieldnames=header, **fmtparams)
+    else:
+        reader = csv.reader(text, **fmtparams)
+
+    return [fn(record) for record in reader]
+
+
+def _jsonl_record_wrapper(filename, fn, start, end):
+    lines = [x for x in _read_range(filename, start, end).splitlines() if x.strip()]
+    # Decode the whole chunk with a single call.
+    records = _json_loads(b"[" + b",".join(lines) + b"]")
+
+    return [fn(record) for record in records]
+
+
+def _fixed_record_wrapper(filename, fn, record_size, start, end):
+    data = memoryview(_read_range(filename, start, end))
+
+    return [
+        fn(bytes(data[i : i + record_size])) for i in range(0, len(data), record_size)
+    ]
+
+
+def _json_loads(data):
+    try:
+        # pylint: disable=import-outside-toplevel
+        import orjson
+    except ModuleNotFoundError:
+        return json.loads(data)
+
+    return orjson.loads(data)
+
+
+def map_records(
+    filename: Union[str, os.PathLike],
+    fn: Callable[[Any], Any],
+    format: str = "lines",  # pylint: disable=redefined-builtin
+    num_workers: int = multiprocessing.cpu_count(),
+    chunk_size: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+    backend: str = "process",
+    header: bool = True,
+    record_size: Optional[int] = None,
+    encoding: Optional[str] = None,
+    **fmtparams,
+) -> Iterable:
+    formats = {"lines", "csv", "jsonl", "fixed"}
+    if format not in formats:
+        raise ValueError(f"Param `format` should be in {formats}")
+
+    if format == "lines":
+        return map_lines(
+            filename,
+            fn,
+            num_workers=num_workers,
+            chunk_size=chunk_size,
+            initializer=initializer,
+            initargs=initargs,
+            backend=backend,
+        )
+
+    backend = _resolve_backend(backend, num_workers)
+    if not chunk_size:
+        chunk_size = _get_chunk_size(filename, num_workers=num_workers)
+
+    if format == "csv":
+        quotechar = _csv_quotechar(encoding, fmtparams)
+        fieldnames, start = None, 0
+        if header:
+            # The header is the first record, which may span several lines.
+            _, start = next(_chunkify_csv(filename, 0, quotechar=quotechar), (0, 0))
+            rows = _csv_record_wrapper(
+                filename, list, None, encoding, fmtparams, 0, start
+            )
+            fieldnames = rows[0] if rows else []
+
+        wrapper = _csv_record_wrapper
+        extra: tuple = (fieldnames, encoding, fmtparams)
+        chunks = _chunkify_csv(filename, chunk_size, start=start, quotechar=quotechar)
+    elif format == "jsonl":
+        wrapper, extra = _jsonl_record_wrapper, ()
+        chunks = chunkify(filename, chunk_size=chunk_size)
+    else:
+        wrapper, extra = _fixed_record_wrapper, (record_size,)
+        chunks = _chunkify_fixed(filename, chunk_size, record_size)
+
+    args = [(filename, fn, *extra, start, end) for start, end in chunks if end > start]
+    data = _starmap(wrapper, args, backend, num_workers, initializer, initargs)
 
     return itertools.chain.from_iterable(data)
+
+
+def _iter_run(filename):
+    with open(filename, mode="r") as f:
+        yield from f
+
+
+def _sort_chunk(filename, key, reverse, unique, dirname, start, end):
+    lines = [
+        line if line.endswith("\n") else f"{line}\n"
+        for line in readlines(filename, start, end)
+    ]
+    lines.sort(key=key, reverse=reverse)
+    if unique:
+        lines = list(_unique_sorted(lines, key))
+
+    fd, run = tempfile.mkstemp(dir=dirname, suffix=".run")
+    with os.fdopen(fd, mode="w") as f:
+        f.writelines(lines)
+
+    return [run]
+
+
+def _unique_sorted(lines, key):
+    previous = _missing
+    for line in lines:
+        k = key(line) if key else line
+        if previous is _missing or k != previous:
+            previous = k
+            yield line
+
+
+def _merge_runs(runs, output, key, reverse, unique):
+    merged = heapq.merge(*map(_iter_run, runs), key=key, reverse=reverse)
+    if unique:
+        merged = _unique_sorted(merged, key)
+
+    with open(output, mode="w") as f:
+        f.writelines(merged)
+
+
+def sort_file(
+    filename: Union[str, os.PathLike],
+    output: Union[str, os.PathLike],
+    key: Optional[Callable[[str], Any]] = None,
+    reverse: bool = False,
+    unique: bool = False,
+    num_workers: int = multiprocessing.cpu_count(),
+    chunk_size: int = 64 * 1024 * 1024,
+    max_runs: int = 256,
+    tmpdir: Optional[Union[str, os.PathLike]] = None,
+    backend: str = "process",
+) -> None:
+    backend = _resolve_backend(backend, num_workers)
+    with tempfile.TemporaryDirectory(dir=tmpdir) as dirname:
+        args = [
+            (filename, key, reverse, unique, dirname, start, end)
+            for start, end in chunkify(filename, chunk_size=chunk_size)
+            if end > start
+        ]
+        runs = list(
+            itertools.chain.from_iterable(
+                _starmap(_sort_chunk, args, backend, num_workers)
+            )
+        )
+
+        # Merge in rounds so that at most `max_runs` files are open at once.
+        while len(runs) > max_runs:
+            merged = []
+            for i in range(0, len(runs), max_runs):
+                fd, run = tempfile.mkstemp(dir=dirname, suffix=".run")
+                os.close(fd)
+                _merge_runs(runs[i : i + max_runs], run, key, reverse, unique)
+                merged += [run]
+            runs = merged
+
+        _merge_runs(runs, output, key, reverse, unique)
+
+
+def _partition_chunk(filename, key, num_partitions, dirname, start, end):
+    partitions = [
+        tempfile.NamedTemporaryFile(
+            mode="w", dir=dirname, suffix=f".{i}.part", delete=False
+        )
+        for i in range(num_partitions)
+    ]
+    try:
+        for i, line in enumerate(readlines(filename, start, end)):
+            if not line.endswith("\n"):
+                line = f"{line}\n"
+            k = key(line) if key else line
+            # Tagged with its position so the output keeps the input order.
+            partitions[zlib.crc32(str(k).encode()) % num_partitions].write(
+                f"{start} {i}\t{line}"
+            )
+    finally:
+        for f in partitions:
+            f.close()
+
+    return [f.name for f in partitions]
+
+
+def _dedup_partition(key, dirname, *parts):
+    seen = set()
+    fd, output = tempfile.mkstemp(dir=dirname, suffix=".dedup")
+    with os.fdopen(fd, mode="w") as f:
+        for part in parts:
+            for tagged in _iter_run(part):
+                line = tagged[tagged.index("\t") + 1 :]
+                k = key(line) if key else line
+                if k not in seen:
+                    seen.add(k)
+                    f.write(tagged)
+            os.remove(part)
+
+    return output
+
+
+def _position(tagged):
+    start, i = tagged[: tagged.index("\t")].split(" ")
+
+    return int(start), int(i)
+
+
+def dedup_file(
+    filename: Union[str, os.PathLike],
+    output: Union[str, os.PathLike],
+    key: Optional[Callable[[str], Hashable]] = None,
+    num_partitions: int = 64,
+    num_workers: int = multiprocessing.cpu_count(),
+    chunk_size: int = 64 * 1024 * 1024,
+    tmpdir: Optional[Union[str, os.PathLike]] = None,
+    backend: str = "process",
+) -> None:
+    backend = _resolve_backend(backend, num_workers)
+    with tempfile.TemporaryDirectory(dir=tmpdir) as dirname:
+        args = [
+            (filename, key, num_partitions, dirname, start, end)
+            for start, end in chunkify(filename, chunk_size=chunk_size)
+            if end > start
+        ]
+        chunks = _starmap(_partition_chunk, args, backend, num_workers)
+
+        # Each partition holds every copy of its keys, in chunk order.
+        args = [(key, dirname, *parts) for parts in zip(*chunks)]
+        outputs = _starmap(_dedup_partition, args, backend, num_workers)
+
+        # Interleave the partitions back into first-occurrence order.
+        merged = heapq.merge(*map(_iter_run, outputs), key=_position)
+        with open(output, mode="w") as f:
+            f.writelines(x[x.index("\t") + 1 :] for x in merged)
+
+
+def _scan_file_groups(dirname, exts, missing, reldir=os.curdir):
+    # Files of a group share a directory, so groups are complete per directory
+    # and can be yielded while the tree is still being walked. Directories and
+    # groups are visited in sorted full-path order, as in `iter_file_groups`.
+    dirpath = dirname if reldir == os.curdir else os.path.join(dirname, reldir)
+    groups: dict[str, list[str]] = {}
+    entries: list[tuple[str, str, Optional[list[str]]]] = []
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # Like `os.walk`, do not follow symlinks to directories.
+                    if not entry.is_symlink():
+                        entries += [(entry.name + os.sep, entry.name, None)]
+                    continue
+
+                stem, ext = os.path.splitext(entry.name)
+                if ext in exts:
+                    groups.setdefault(stem, []).append(entry.name)
+    except OSError:
+        return
+
+    for stem, names in groups.items():
+        names.sort()
+        entries += [(names[0], stem, names)]
+
+    num_exts = len(exts)
+    for _, name, names in sorted(entries):
+        key = name if reldir == os.curdir else os.path.join(reldir, name)
+        if names is None:
+            yield from _scan_file_groups(dirname, exts, missing, key)
+            continue
+
+        if len(names) != num_exts and missing == "error":
+            raise RuntimeError(f"Missing files: {key}.{exts}")
+
+        yield key, [os.path.join(dirpath, x) for x in names]
+
+
+def _pop_result(pending, ordered):
+    if ordered:
+        key, future = pending.popleft()
+    else:
+        done, _ = concurrent.futures.wait(
+            [future for _, future in pending],
+            return_when=concurrent.futures.FIRST_COMPLETED,
+        )
+        key, future = next(x for x in pending if x[1] in done)
+        pending.remove((key, future))
+
+    return key, future.result()
+
+
+def map_file_groups(
+    dirname: str,
+    exts: Union[str, Iterable[str]],
+    fn: Callable[[list[str]], Any],
+    num_workers: int = multiprocessing.cpu_count(),
+    backend: str = "process",
+    ordered: bool = True,
+    prefetch: Optional[int] = None,
+    missing: str = "error",
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+) -> Generator[tuple[str, Any], None, None]:
+    groups = _scan_file_groups(dirname, _file_group_exts(exts, missing), missing)
+
+    backend = _resolve_backend(backend, num_workers)
+    if backend == "serial":
+        if initializer is not None:
+            initializer(*initargs)
+
+        for key, group in groups:
+            yield key, fn(group)
+        return
+
+    if prefetch is None:
+        prefetch = 2 * num_workers
+    prefetch = max(prefetch, 1)
+
+    executor_class: type[concurrent.futures.Executor]
+    if backend == "thread":
+        executor_class = concurrent.futures.ThreadPoolExecutor
+    else:
+        executor_class = concurrent.futures.ProcessPoolExecutor
+
+    pending: collections.deque = collections.deque()
+    with executor_class(
+        max_workers=num_workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        try:
+            for key, group in groups:
+                pending.append((key, executor.submit(fn, group)))
+                if len(pending) >= prefetch:
+                    yield _pop_result(pending, ordered)
+
+            while pending:
+                yield _pop_result(pending, ordered)
+        finally:
+            for _, future in pending:
+                future.cancel()
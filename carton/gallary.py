@@ -2,18 +2,83 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
-from typing import Union
+import functools
+import math
+import os
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Optional, Union
 
-try:
-    import pandas as pd
-    import plotly.graph_objects as go
-    import streamlit as st
+if TYPE_CHECKING:
     from pandas import DataFrame
-except ModuleNotFoundError:
-    raise RuntimeError(
-        "Please install `pandas`, `streamlit` and `plotly` library to use gallary."
-    )
+
+
+def _import_dependencies():
+    # pylint: disable=import-outside-toplevel
+    try:
+        import pandas as pd
+        import plotly.graph_objects as go
+        import streamlit as st
+    except ModuleNotFoundError as e:
+        raise RuntimeError(
+            "Please install `pandas`, `streamlit` and `plotly` library to use gallary."
+        ) from e
+
+    return pd, go, st
+
+
+@functools.lru_cache(maxsize=None)
+def _cached(fn: Callable) -> Callable:
+    *_, st = _import_dependencies()
+
+    # Cached frames are shared between reruns without copying.
+    cache = getattr(st, "cache_resource", None)
+    if cache is None:
+        cache = getattr(st, "experimental_singleton", None)
+    if cache is None:
+        cache = functools.partial(st.cache, allow_output_mutation=True)
+
+    return cache(fn)
+
+
+def read_frame(filename: str, memory_map: bool = True) -> DataFrame:
+    pd, *_ = _import_dependencies()
+
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(filename, memory_map=memory_map)
+
+    if ext in {".feather", ".arrow"}:
+        return pd.read_feather(filename)
+
+    return pd.read_csv(filename, memory_map=memory_map)
+
+
+def _load_scores(filename, k_field, mtime):
+    # pylint: disable=unused-argument
+    return read_frame(filename).sort_values(k_field, ignore_index=True)
+
+
+def _downsample(df_score, k_field, field, max_points):
+    # pylint: disable=import-outside-toplevel
+    from carton.data import lttb
+
+    data = df_score[[k_field, field]].dropna()
+    # LTTB assumes sorted x; frames passed in directly may not be sorted.
+    if not data[k_field].is_monotonic_increasing:
+        data = data.sort_values(k_field, kind="stable")
+    if not max_points or len(data) <= max_points:
+        return data[k_field], data[field]
+
+    indices = lttb(data[k_field], data[field], max_points)
+
+    return data[k_field].iloc[indices], data[field].iloc[indices]
+
+
+def _load_predictions(filename, label_field, mtime):
+    # pylint: disable=unused-argument
+    df = read_frame(filename)
+
+    return df, df.groupby(label_field, sort=True).indices
 
 
 def display_clustering(
@@ -23,9 +88,15 @@ def display_clustering(
     k_field: str = "k",
     score_fields: Union[str, Iterable[str]] = "score",
     width: int = 1000,
+    label_field: str = "prediction",
+    max_points: Optional[int] = 2000,
 ) -> None:
+    _, go, st = _import_dependencies()
+
     if isinstance(df_score, str):
-        df_score = pd.read_csv(df_score)
+        df_score = _cached(_load_scores)(
+            df_score, k_field, os.path.getmtime(df_score)
+        )
 
     if isinstance(score_fields, str):
         score_fields = [score_fields]
@@ -37,17 +108,30 @@ def display_clustering(
 
     st.sidebar.header("Files")
     filename = st.sidebar.selectbox("Select a file", list(prediction_files))
-    df = pd.read_csv(filename)
+    df, label_index = _cached(_load_predictions)(
+        filename, label_field, os.path.getmtime(filename)
+    )
 
     st.sidebar.header("Label")
-    label = st.sidebar.selectbox("Select a label", sorted(df["prediction"].unique()))
+    label = st.sidebar.selectbox("Select a label", list(label_index))
 
-    filtered = df[df["prediction"] == label]
+    rows = label_index[label]
 
     st.sidebar.header("Options")
-    limit = st.sidebar.slider(
-        "Numers of examples", min_value=1, max_value=len(filtered), value=limit
+    if len(rows) > 1:
+        limit = st.sidebar.slider(
+            "Numers of examples",
+            min_value=1,
+            max_value=len(rows),
+            value=min(limit, len(rows)),
+        )
+    else:
+        # A slider needs `min_value < max_value`.
+        limit = 1
+    page = st.sidebar.number_input(
+        "Page", min_value=1, max_value=math.ceil(len(rows) / limit), value=1
     )
+    sample = st.sidebar.checkbox("Random sample", False)
     hide_overview = st.sidebar.checkbox("Hide overview", False)
 
     # Body
@@ -59,10 +143,11 @@ def display_clustering(
         w = 0.1
         fig = go.Figure()
         for i, field in enumerate(score_fields):
+            x, y = _downsample(df_score, k_field, field, max_points)
             fig.add_trace(
-                go.Scatter(
-                    x=df_score[k_field],
-                    y=df_score[field],
+                go.Scattergl(
+                    x=x,
+                    y=y,
                     name=field,
                     yaxis=f"y{i + 1}" if i > 0 else "y",
                 )
@@ -102,4 +187,13 @@ def display_clustering(
 
     # Predictions
     st.header("Predictions")
-    st.table(filtered.iloc[:limit])
+    if sample:
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+
+        # The page number seeds the sample so reruns stay stable.
+        rng = np.random.default_rng(int(page))
+        rows = np.sort(rng.choice(rows, size=limit, replace=False))
+    else:
+        rows = rows[(page - 1) * limit : page * limit]
+    st.table(df.iloc[rows])
@@ -2,12 +2,108 @@
 
 from __future__ import annotations
 
+import functools
+import json
 import logging
+import logging.handlers
 import os
 import sys
+import weakref
 from collections.abc import Mapping
+from queue import Full, Queue
 from typing import Optional, Union
 
+_queue_handlers: weakref.WeakSet = weakref.WeakSet()
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Block rather than raise when a bounded queue is full.
+        self.queue.put(self._sentinel)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, handlers, maxsize=0, block=True):
+        super().__init__(Queue(maxsize))
+        self.block = block
+        self.dropped = 0
+        self.target_handlers = handlers
+        self.listener = None
+        self.setFormatter(logging.Formatter())
+        self._start()
+        _queue_handlers.add(self)
+
+    def _start(self):
+        self.listener = _QueueListener(
+            self.queue, *self.target_handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def _after_fork(self):
+        # The listener thread does not survive a fork.
+        self.queue = Queue(self.queue.maxsize)
+        self.dropped = 0
+        self._start()
+
+    def enqueue(self, record):
+        if self.block:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def _report_dropped(self):
+        record = logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            "Dropped %d log records because the queue was full",
+            (self.dropped,),
+            None,
+        )
+        self.dropped = 0
+        for handler in self.target_handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+            if self.dropped:
+                self._report_dropped()
+            for handler in self.target_handlers:
+                handler.close()
+        super().close()
+
+
+def _close_queue_handlers():
+    for handler in list(_queue_handlers):
+        handler.close()
+
+
+def _after_fork_in_child():
+    # pylint: disable=import-outside-toplevel
+    import multiprocessing.util
+
+    handlers = list(_queue_handlers)
+    if not handlers:
+        return
+
+    for handler in handlers:
+        handler._after_fork()  # pylint: disable=protected-access
+
+    # Pool workers leave via `os._exit`, which skips `logging.shutdown`.
+    multiprocessing.util.Finalize(None, _close_queue_handlers, exitpriority=100)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
 
 def _setup_handlers(logger, handlers=None, reset=True):
     if reset:
@@ -20,15 +116,60 @@ def _setup_handlers(logger, handlers=None, reset=True):
             logger.addHandler(handler)
 
 
-def _setup_formaters(logger, format_):
-    for handler in logger.handlers:
-        handler.setFormatter(logging.Formatter(format_))
+def _setup_formaters(handlers, formatter):
+    for handler in handlers:
+        if isinstance(handler, _QueueHandler):
+            continue
+        handler.setFormatter(formatter)
 
 
-def _setup_logger(logger, level, format_, handlers):
+def _setup_logger(logger, level, handlers):
     logger.setLevel(level)
     _setup_handlers(logger, handlers, reset=True)
-    _setup_formaters(logger, format_)
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dumps = _get_json_dumps()
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if hasattr(record, "data"):
+            data["data"] = record.data
+
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+
+        return self._dumps(data)
+
+
+def _get_json_dumps():
+    try:
+        # pylint: disable=import-outside-toplevel
+        import orjson
+    except ModuleNotFoundError:
+        return functools.partial(json.dumps, ensure_ascii=False, default=str)
+
+    def dumps(data):
+        return orjson.dumps(
+            data, default=str, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    return dumps
+
+
+@functools.lru_cache(maxsize=None)
+def _get_formatter(format_, structured):
+    if structured:
+        return JsonFormatter()
+
+    return logging.Formatter(format_)
 
 
 #  pylint: disable=redefined-builtin
@@ -39,17 +180,26 @@ def setup_logger(
     force: bool = True,
     stream: bool = True,
     filename: Optional[Union[str, bytes, os.PathLike]] = None,
+    queue: bool = False,
+    queue_size: int = 0,
+    queue_block: bool = True,
+    structured: bool = False,
     **kwargs,
 ) -> None:
-    handlers = []
+    handlers: list[logging.Handler] = []
     if stream:
         handlers += [logging.StreamHandler()]
 
     if filename:
         handlers += [logging.FileHandler(filename)]
 
+    _setup_formaters(handlers, _get_formatter(format, structured))
+
+    if queue:
+        handlers = [_QueueHandler(handlers, maxsize=queue_size, block=queue_block)]
+
     if logger is not None:
-        _setup_logger(logger, level, format, handlers)
+        _setup_logger(logger, level, handlers)
         return
 
     kwargs = {"level": level, "format": format, "handlers": handlers}
@@ -62,6 +212,30 @@ def setup_logger(
     logging.basicConfig(**kwargs)
 
 
-def log_dict(_logger: logging.Logger, d: Mapping, sep: str = " = ") -> None:
-    for key, value in d.items():
-        _logger.info(f"{key}{sep}{value}")
+class _DictMessage:
+    __slots__ = ("d", "sep", "delimiter")
+
+    def __init__(self, d, sep, delimiter):
+        self.d = d
+        self.sep = sep
+        self.delimiter = delimiter
+
+    def __str__(self):
+        return self.delimiter.join(
+            f"{key}{self.sep}{value}" for key, value in self.d.items()
+        )
+
+
+def log_dict(
+    _logger: logging.Logger,
+    d: Mapping,
+    sep: str = " = ",
+    delimiter: str = ", ",
+    level: int = logging.INFO,
+) -> None:
+    if not _logger.isEnabledFor(level):
+        return
+
+    # Queued records are formatted later; snapshot `d` so they log this state.
+    d = dict(d)
+    _logger.log(level, "%s", _DictMessage(d, sep, delimiter), extra={"data": d})
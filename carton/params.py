@@ -2,13 +2,190 @@
 
 from __future__ import annotations
 
+import contextlib
 import copy
+import hashlib
+import importlib
 import json
+import os
+import pickle
+import tempfile
 from collections.abc import Mapping
-from typing import Optional, Type, TypeVar
+from typing import Any, Callable, Optional, Type, TypeVar, Union
 
-import pytoml
-from ruyaml import YAML
+Loader = Callable[..., Any]
+
+
+def _import_module(module):
+    try:
+        module = importlib.import_module(module)
+    except ModuleNotFoundError:
+        return None
+
+    return module
+
+
+def _json_loader():
+    orjson = _import_module("orjson")
+    if not orjson:
+        return json.loads
+
+    def loads(text, **kwargs):
+        if kwargs:
+            return json.loads(text, **kwargs)
+
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # `json` also accepts NaN, Infinity and integers wider than 64 bits.
+            return json.loads(text)
+
+    loads.backend = "orjson"  # type: ignore
+
+    return loads
+
+
+def _toml_loader():
+    toml = _import_module("tomllib") or _import_module("tomli")
+    if not toml:
+        # pylint: disable=import-outside-toplevel
+        import pytoml
+
+        return pytoml.loads
+
+    def loads(text, **kwargs):
+        if kwargs:
+            # pylint: disable=import-outside-toplevel
+            import pytoml
+
+            return pytoml.loads(text, **kwargs)
+
+        return toml.loads(text)
+
+    loads.backend = toml.__name__  # type: ignore
+
+    return loads
+
+
+def _yaml_loader():
+    # Always YAML 1.2 via ruyaml, which uses its C parser when it is built.
+    # pylint: disable=import-outside-toplevel
+    from ruyaml import YAML
+
+    loader = YAML(typ="safe")
+
+    def loads(text, **kwargs):
+        return loader.load(text, **kwargs)
+
+    loads.backend = "ruyaml"  # type: ignore
+
+    return loads
+
+
+_LOADER_FACTORIES: dict[str, Callable[[], Loader]] = {
+    "json": _json_loader,
+    "toml": _toml_loader,
+    "yaml": _yaml_loader,
+}
+_LOADERS: dict[str, Loader] = {}
+
+
+def register_loader(format_: str, loader: Loader) -> None:
+    _LOADERS[format_] = loader
+
+
+def _loader_name(loader):
+    name = getattr(loader, "backend", None)
+    if name is None:
+        name = f"{loader.__module__}.{loader.__qualname__}"
+
+    return name
+
+
+def get_loader(format_: str) -> Loader:
+    loader = _LOADERS.get(format_)
+    if loader is None:
+        if format_ not in _LOADER_FACTORIES:
+            raise ValueError(f"Unsupported config format: {format_!r}")
+        loader = _LOADERS[format_] = _LOADER_FACTORIES[format_]()
+
+    return loader
+
+
+_MEMORY_CACHE: dict[tuple[str, str], tuple[int, int, bytes]] = {}
+
+
+def clear_cache() -> None:
+    _MEMORY_CACHE.clear()
+
+
+def _cache_filename(cache_dir, key):
+    digest = hashlib.sha1("\0".join(key).encode()).hexdigest()
+
+    return os.path.join(cache_dir, f"{digest}.pickle")
+
+
+def _read_cache(cache_dir, key, mtime, size):
+    cached = _MEMORY_CACHE.get(key)
+    if cached is None and cache_dir is not None:
+        try:
+            with open(_cache_filename(cache_dir, key), mode="rb") as f:
+                cached = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    if cached is None or cached[:2] != (mtime, size):
+        return None
+
+    _MEMORY_CACHE[key] = cached
+
+    return cached[2]
+
+
+def _write_cache(cache_dir, key, cached):
+    _MEMORY_CACHE[key] = cached
+    if cache_dir is None:
+        return
+
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode="wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _cache_filename(cache_dir, key))
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def _load(filename, format_, file_kwargs, cache, kwargs):
+    if not file_kwargs:
+        file_kwargs = {"mode": "r"}
+
+    loader = get_loader(format_)
+
+    def _parse():
+        with open(filename, **file_kwargs) as f:
+            return loader(f.read(), **kwargs)
+
+    if not cache or kwargs:
+        return _parse()
+
+    cache_dir = None if cache is True else os.fspath(cache)
+    key = (os.path.abspath(filename), format_, _loader_name(loader))
+    stat = os.stat(filename)
+    mtime, size = stat.st_mtime_ns, stat.st_size
+
+    payload = _read_cache(cache_dir, key, mtime, size)
+    if payload is not None:
+        return pickle.loads(payload)
+
+    data = _parse()
+    payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    _write_cache(cache_dir, key, (mtime, size, payload))
+
+    return data
 
 
 class Params(dict):
@@ -50,6 +227,9 @@ class Params(dict):
         if not kwargs:
             kwargs = {}
 
+        # pylint: disable=import-outside-toplevel
+        from ruyaml import YAML
+
         with open(filename, **file_kwargs) as f:
             YAML().dump(dict(self), f, **kwargs)
 
@@ -59,42 +239,45 @@ class Params(dict):
         if not file_kwargs:
             file_kwargs = {"mode": "w"}
 
+        # pylint: disable=import-outside-toplevel
+        import pytoml
+
         with open(filename, **file_kwargs) as f:
             pytoml.dump(self, f, **kwargs)
 
     @classmethod
     def from_json_string(cls: Type[T], json_string: str, **kwargs) -> T:
-        return cls(json.loads(json_string, **kwargs))
+        return cls(get_loader("json")(json_string, **kwargs))
 
     @classmethod
     def from_json(
-        cls: Type[T], filename: str, file_kwargs: Optional[Mapping] = None, **kwargs
+        cls: Type[T],
+        filename: str,
+        file_kwargs: Optional[Mapping] = None,
+        cache: Union[bool, str, os.PathLike] = False,
+        **kwargs,
     ) -> T:
-        if not file_kwargs:
-            file_kwargs = {"mode": "r"}
-
-        with open(filename, **file_kwargs) as f:
-            return cls(json.load(f, **kwargs))
+        return cls(_load(filename, "json", file_kwargs, cache, kwargs))
 
     loads = from_json_string
     load = from_json
 
     @classmethod
     def from_toml(
-        cls: Type[T], filename: str, file_kwargs: Optional[Mapping] = None, **kwargs
+        cls: Type[T],
+        filename: str,
+        file_kwargs: Optional[Mapping] = None,
+        cache: Union[bool, str, os.PathLike] = False,
+        **kwargs,
     ) -> T:
-        if not file_kwargs:
-            file_kwargs = {"mode": "r"}
-
-        with open(filename, **file_kwargs) as f:
-            return cls(pytoml.load(f, **kwargs))
+        return cls(_load(filename, "toml", file_kwargs, cache, kwargs))
 
     @classmethod
     def from_yaml(
-        cls: Type[T], filename: str, file_kwargs: Optional[Mapping] = None, **kwargs
+        cls: Type[T],
+        filename: str,
+        file_kwargs: Optional[Mapping] = None,
+        cache: Union[bool, str, os.PathLike] = False,
+        **kwargs,
     ) -> T:
-        if not file_kwargs:
-            file_kwargs = {"mode": "r"}
-
-        with open(filename, **file_kwargs) as f:
-            return cls(YAML(typ="safe").load(f, **kwargs))
+        return cls(_load(filename, "yaml", file_kwargs, cache, kwargs))
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import io
+import logging
+import random
+import time
+from collections.abc import Iterator
+from typing import Any, Callable, Optional, TypeVar
+
+from carton.logger import log_dict
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = True
+_timings: dict[str, _Stats] = {}
+_max_samples = 10000
+# Private, so profiling never consumes numbers from the global `random` stream.
+_random = random.Random()
+
+_UNITS = {"ns": 1, "us": 1e3, "ms": 1e6, "s": 1e9}
+
+
+def enable() -> None:
+    # pylint: disable=global-statement
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    # pylint: disable=global-statement
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset(name: Optional[str] = None) -> None:
+    if name is None:
+        _timings.clear()
+    else:
+        _timings.pop(name, None)
+
+
+def set_max_samples(n: int) -> None:
+    if n <= 0:
+        raise ValueError("Param `n` should be positive")
+
+    # pylint: disable=global-statement
+    global _max_samples
+    _max_samples = n
+
+
+class _Stats(object):
+    __slots__ = ("count", "total", "min", "max", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self.samples: list[int] = []
+
+    def add(self, elapsed_ns: int) -> None:
+        if not self.count or elapsed_ns < self.min:
+            self.min = elapsed_ns
+        if not self.count or elapsed_ns > self.max:
+            self.max = elapsed_ns
+        self.count += 1
+        self.total += elapsed_ns
+
+        # Uniform reservoir of the samples, for the percentiles only.
+        if len(self.samples) < _max_samples:
+            self.samples.append(elapsed_ns)
+        else:
+            i = _random.randrange(self.count)
+            if i < len(self.samples):
+                self.samples[i] = elapsed_ns
+
+
+def record(name: str, elapsed_ns: int) -> None:
+    stats = _timings.get(name)
+    if stats is None:
+        stats = _timings[name] = _Stats()
+    stats.add(elapsed_ns)
+
+
+class Timer(object):
+    __slots__ = ("name", "start", "elapsed_ns")
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name
+        self.start = 0
+        self.elapsed_ns = 0
+
+    def __enter__(self) -> Timer:
+        if _enabled:
+            self.start = time.perf_counter_ns()
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if not self.start:
+            return
+
+        self.elapsed_ns = time.perf_counter_ns() - self.start
+        self.start = 0
+        if self.name is not None:
+            record(self.name, self.elapsed_ns)
+
+    @property
+    def elapsed(self) -> float:
+        return self.elapsed_ns / 1e9
+
+    def __call__(self, fn: F) -> F:
+        name = self.name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter_ns() - start)
+
+        return wrapper  # type: ignore
+
+
+def timer(name: Optional[str] = None) -> Timer:
+    return Timer(name)
+
+
+def timings(unit: str = "ms") -> dict[str, list[float]]:
+    if unit not in _UNITS:
+        raise ValueError(f"Param `unit` should be in {set(_UNITS)}")
+
+    scale = _UNITS[unit]
+
+    return {
+        name: [x / scale for x in stats.samples] for name, stats in _timings.items()
+    }
+
+
+def summary(unit: str = "ms", r: int = 3) -> dict[str, dict]:
+    # pylint: disable=import-outside-toplevel
+    from carton.data import describe_series
+
+    samples = timings(unit=unit)
+    scale = _UNITS[unit]
+    summaries = {}
+    for name, values in samples.items():
+        stats = _timings[name]
+        info = describe_series(values, r=r)
+        info.update(
+            {
+                "size": stats.count,
+                "mean": round(stats.total / stats.count / scale, r),
+                "min": stats.min / scale,
+                "max": stats.max / scale,
+                "total": round(stats.total / scale, r),
+            }
+        )
+        summaries[name] = info
+
+    return summaries
+
+
+def log_summary(
+    logger: logging.Logger, unit: str = "ms", r: int = 3, level: int = logging.INFO
+) -> None:
+    if not logger.isEnabledFor(level):
+        return
+
+    for name, info in summary(unit=unit, r=r).items():
+        log_dict(logger, {"timer": name, "unit": unit, **info}, level=level)
+
+
+@contextlib.contextmanager
+def profile(
+    logger: Optional[logging.Logger] = None,
+    sort: str = "cumulative",
+    limit: int = 20,
+    memory: bool = False,
+    level: int = logging.INFO,
+) -> Iterator[dict[str, Any]]:
+    # pylint: disable=import-outside-toplevel
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    result: dict[str, Any] = {}
+    if not _enabled:
+        yield result
+        return
+
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            result["memory"] = snapshot.statistics("lineno")[:limit]
+            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            if tracing:
+                tracemalloc.stop()
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(sort).print_stats(limit)
+        result["stats"] = stats
+        result["report"] = stream.getvalue()
+
+        if logger is not None and logger.isEnabledFor(level):
+            logger.log(level, "%s", result["report"])
+            for stat in result.get("memory", []):
+                logger.log(level, "%s", stat)
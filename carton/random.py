@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import contextlib
+import heapq
 import importlib
+import itertools
+import math
 import random
-from collections.abc import Iterator
-from typing import Optional, Union
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, ContextManager, Optional, TypeVar, Union
 
 from carton.palette import Colors
 
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.random import Generator, SeedSequence
+
+T = TypeVar("T")
+
+_missing = object()
+
 
 def random_state(
     seed: Optional[int] = None, low: int = 0, high: int = 2 ** 32 - 1
@@ -29,41 +40,142 @@ def _import_module(module):
     return module
 
 
-def set_seed(seed: int, debug: bool = False) -> tuple:
-    states: tuple = (random.getstate(),)
+class Seeder(object):
+    def __init__(self, numpy: bool = True, torch: bool = True, cuda: bool = True):
+        self.use_numpy = numpy
+        self.use_torch = torch
+        self.use_cuda = cuda
+        self._resolved = False
+        self.numpy = None
+        self.torch = None
+        self.cuda = False
 
-    random.seed(seed)
+    def _resolve(self):
+        if self._resolved:
+            return
 
-    numpy = _import_module("numpy")
-    if numpy:
-        states += (numpy.random.get_state(),)
-        numpy.random.seed(seed)
-
-    torch = _import_module("torch")
-    if torch:
-        cuda = torch.cuda.is_available()
-
-        states += (
-            torch.get_rng_state(),
-            torch.cuda.get_rng_state() if cuda else None,
-            torch.cuda.get_rng_state_all() if cuda else None,
-        )
-        torch.manual_seed(seed)
-        torch.random.manual_seed(seed)
-        torch.cuda.manual_seed(seed)
-        torch.cuda.manual_seed_all(seed)
-
-        if debug:
+        if self.use_numpy:
+            self.numpy = _import_module("numpy")
+        if self.use_torch:
+            self.torch = _import_module("torch")
+            self.cuda = bool(
+                self.torch and self.use_cuda and self.torch.cuda.is_available()
+            )
+        self._resolved = True
+
+    def get_state(self) -> tuple:
+        self._resolve()
+        states: tuple = (random.getstate(),)
+        if self.numpy:
+            states += (self.numpy.random.get_state(),)
+
+        if self.torch:
+            # The middle slot keeps the tuple layout; `get_rng_state_all()`
+            # already includes the current device.
             states += (
-                torch.backends.cudnn.enabled,
-                torch.backends.cudnn.benchmark,
-                torch.backends.cudnn.deterministic,
+                self.torch.get_rng_state(),
+                None,
+                self.torch.cuda.get_rng_state_all() if self.cuda else None,
             )
-            torch.backends.cudnn.enabled = False
-            torch.backends.cudnn.benchmark = False
-            torch.backends.cudnn.deterministic = True
 
-    return states
+        return states
+
+    def set_state(self, states: tuple) -> None:
+        self._resolve()
+        random.setstate(states[0])
+        i = 1
+        if self.numpy:
+            self.numpy.random.set_state(states[i])
+            i += 1
+
+        if self.torch:
+            cpu, _, cuda_all = states[i : i + 3]
+            self.torch.set_rng_state(cpu)
+            if cuda_all is not None:
+                self.torch.cuda.set_rng_state_all(cuda_all)
+            i += 3
+
+            if len(states) > i:
+                cudnn = self.torch.backends.cudnn
+                cudnn.enabled, cudnn.benchmark, cudnn.deterministic = states[i:]
+
+    def seed(self, seed: int, debug: bool = False, capture: bool = True) -> tuple:
+        states = self.get_state() if capture else ()
+        self._resolve()
+
+        random.seed(seed)
+        if self.numpy:
+            self.numpy.random.seed(seed)
+
+        if self.torch:
+            # Seeds the CPU and every CUDA device.
+            self.torch.manual_seed(seed)
+
+            if debug:
+                cudnn = self.torch.backends.cudnn
+                if capture:
+                    states += (cudnn.enabled, cudnn.benchmark, cudnn.deterministic)
+                cudnn.enabled = False
+                cudnn.benchmark = False
+                cudnn.deterministic = True
+
+        return states
+
+    @contextlib.contextmanager
+    def __call__(self, random_seed: int, debug: bool = False) -> Iterator[None]:
+        states = self.seed(random_seed, debug=debug, capture=True)
+        try:
+            yield
+        finally:
+            self.set_state(states)
+
+
+_seeder = Seeder()
+
+
+def set_seed(seed: int, debug: bool = False, capture: bool = True) -> tuple:
+    return _seeder.seed(seed, debug=debug, capture=capture)
+
+
+def get_state() -> tuple:
+    return _seeder.get_state()
+
+
+def set_state(states: tuple) -> None:
+    _seeder.set_state(states)
+
+
+def seed_all(random_seed: int, debug: bool = False) -> ContextManager[None]:
+    return _seeder(random_seed, debug=debug)
+
+
+def seed_sequence(seed: Optional[int] = None, *key: int) -> "SeedSequence":
+    # pylint: disable=import-outside-toplevel
+    from numpy.random import SeedSequence
+
+    return SeedSequence(seed, spawn_key=key)
+
+
+def spawn_seeds(seed: Optional[int], num: int, *key: int) -> list[int]:
+    return [
+        int(x.generate_state(1)[0]) for x in seed_sequence(seed, *key).spawn(num)
+    ]
+
+
+def derive_seed(seed: Optional[int], *key: int) -> int:
+    return int(seed_sequence(seed, *key).generate_state(1)[0])
+
+
+def get_generator(seed: Optional[int], *key: int) -> "Generator":
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    return np.random.default_rng(seed_sequence(seed, *key))
+
+
+def seed_chunk(seed: int, chunk_idx: int, debug: bool = False) -> None:
+    # Keyed by the chunk, so results do not depend on which worker runs it.
+    set_seed(derive_seed(seed, chunk_idx), debug=debug, capture=False)
 
 
 @contextlib.contextmanager
@@ -83,6 +195,83 @@ def random_string(
     return "".join(random.choices(chars, k=length))
 
 
+def random_strings(
+    num: int,
+    length: int = 10,
+    chars: str = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    as_array: bool = False,
+    rng: Optional["Generator"] = None,
+) -> Union[list[str], "np.ndarray"]:
+    numpy = _import_module("numpy")
+    if not numpy:
+        if as_array:
+            raise RuntimeError("Please install `numpy` to generate string arrays.")
+
+        return [random_string(length=length, chars=chars) for _ in range(num)]
+
+    if rng is None:
+        # Follow the global `random` state so `set_seed` and `seed` apply.
+        rng = numpy.random.default_rng(random.getrandbits(64))
+
+    alphabet = numpy.array([ord(x) for x in chars], dtype=numpy.uint32)
+    codes = alphabet[rng.integers(0, len(alphabet), size=(num, length))]
+    strings = codes.view(f"<U{length}").reshape(num) if length else numpy.full(num, "")
+
+    return strings if as_array else strings.tolist()
+
+
+def reservoir_sample(
+    iterable: Iterable[T], k: int, rng: Optional[random.Random] = None
+) -> list[T]:
+    # Algorithm L: skip ahead geometrically instead of drawing per item.
+    if k <= 0:
+        return []
+
+    if rng is None:
+        rng = random.Random(random.getrandbits(64))
+    it = iter(iterable)
+    reservoir = list(itertools.islice(it, k))
+    if len(reservoir) < k:
+        return reservoir
+
+    w = math.exp(math.log(1 - rng.random()) / k)
+    while True:
+        skip = math.floor(math.log(1 - rng.random()) / math.log1p(-w))
+        item = next(itertools.islice(it, skip, None), _missing)
+        if item is _missing:
+            return reservoir
+
+        reservoir[rng.randrange(k)] = item
+        w *= math.exp(math.log(1 - rng.random()) / k)
+
+
+def weighted_reservoir_sample(
+    iterable: Iterable[T],
+    k: int,
+    weight: Callable[[T], float],
+    rng: Optional[random.Random] = None,
+) -> list[T]:
+    # Algorithm A-Res: keep the k items with the largest u ** (1 / w).
+    if k <= 0:
+        return []
+
+    if rng is None:
+        rng = random.Random(random.getrandbits(64))
+    heap: list[tuple[float, int, T]] = []
+    for i, item in enumerate(iterable):
+        w = weight(item)
+        if w <= 0:
+            continue
+
+        key = math.log(1 - rng.random()) / w
+        if len(heap) < k:
+            heapq.heappush(heap, (key, i, item))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, i, item))
+
+    return [item for *_, item in sorted(heap, reverse=True)]
+
+
 def random_colors(
     colors: Optional[list[str]] = None,
     num: int = 1,
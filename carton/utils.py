@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+from __future__ import annotations
+
+import contextlib
 import os
 import shutil
 import subprocess
+import zlib
 from typing import TypeVar
 
 T = TypeVar("T")
@@ -20,25 +24,130 @@ def identity(x: T) -> T:
     return x
 
 
-def git_version(dirname: str) -> str:
-    if not shutil.which("git"):
-        raise RuntimeError("Command not found: git")
+def _find_git_dir(dirname):
+    while True:
+        dotgit = os.path.join(dirname, ".git")
+        if os.path.isdir(dotgit):
+            return dirname, dotgit
+
+        if os.path.isfile(dotgit):
+            # Worktrees and submodules point to their git dir.
+            with open(dotgit, mode="r") as f:
+                content = f.read().strip()
+            if content.startswith("gitdir:"):
+                gitdir = content[len("gitdir:") :].strip()
+                return dirname, os.path.normpath(os.path.join(dirname, gitdir))
+
+        parent = os.path.dirname(dirname)
+        if parent == dirname:
+            return None, None
+        dirname = parent
+
+
+def _common_dir(git_dir):
+    try:
+        with open(os.path.join(git_dir, "commondir"), mode="r") as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except FileNotFoundError:
+        return git_dir
+
+
+def _read_ref(git_dir, ref):
+    for dirname in dict.fromkeys([git_dir, _common_dir(git_dir)]):
+        try:
+            with open(os.path.join(dirname, ref), mode="r") as f:
+                return f.read().strip()
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        try:
+            with open(os.path.join(dirname, "packed-refs"), mode="r") as f:
+                for line in f:
+                    if line.endswith(f" {ref}\n") or line.endswith(f" {ref}"):
+                        return line.split(" ", 1)[0]
+        except FileNotFoundError:
+            pass
+
+    return None
+
+
+def _read_head(git_dir):
+    with open(os.path.join(git_dir, "HEAD"), mode="r") as f:
+        head = f.read().strip()
+
+    if head.startswith("ref:"):
+        ref = head[len("ref:") :].strip()
+        return ref, _read_ref(git_dir, ref)
+
+    return None, head
+
+
+def _stat_signature(*paths):
+    signature = []
+    for p in paths:
+        try:
+            stat = os.stat(p)
+        except FileNotFoundError:
+            signature += [None]
+        else:
+            signature += [(stat.st_mtime_ns, stat.st_size, stat.st_ino)]
+
+    return tuple(signature)
+
+
+def _read_commit_subject(git_dir, sha):
+    # Only loose objects are read here; packed ones fall back to `git`.
+    path = os.path.join(_common_dir(git_dir), "objects", sha[:2], sha[2:])
+    try:
+        with open(path, mode="rb") as f:
+            data = zlib.decompress(f.read())
+    except (FileNotFoundError, zlib.error):
+        return None
+
+    header, _, body = data.partition(b"\0")
+    if not header.startswith(b"commit "):
+        return None
+
+    _, _, message = body.partition(b"\n\n")
 
+    # Like `git log --pretty=oneline`, fold the first paragraph into one line.
+    lines: list[str] = []
+    for line in message.decode(errors="replace").splitlines():
+        line = line.rstrip()
+        if line:
+            lines += [line]
+        elif lines:
+            break
+
+    return " ".join(lines)
+
+
+def git_head(dirname: str) -> str:
     dirname = os.path.abspath(os.path.expanduser(dirname))
     if not os.path.isdir(dirname):
         dirname = os.path.dirname(dirname)
 
-    cmd = [
-        "git",
-        "--no-pager",
-        "log",
-        "--pretty=oneline",
-        "--abbrev-commit",
-        "-1",
-    ]
+    _, git_dir = _find_git_dir(dirname)
+    if git_dir is None:
+        raise RuntimeError(f"Not a git repository: {dirname}")
+
+    _, sha = _read_head(git_dir)
+    if not sha:
+        raise RuntimeError(f"Failed to resolve HEAD: {dirname}")
+
+    return sha
+
+
+_git_version_cache: dict[str, tuple[tuple, str]] = {}
+
+
+def _run_git(cmd, dirname):
+    if not shutil.which("git"):
+        raise RuntimeError("Command not found: git")
+
     try:
         proc = subprocess.run(
-            cmd,
+            ["git", "--no-pager", *cmd],
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
@@ -48,3 +157,51 @@ def git_version(dirname: str) -> str:
         raise RuntimeError(f"Failed to fetch git version: {e!s}") from e
 
     return proc.stdout.decode().strip()
+
+
+def _git_version(dirname, git_dir, abbrev):
+    if git_dir is not None:
+        with contextlib.suppress(OSError):
+            _, sha = _read_head(git_dir)
+            subject = _read_commit_subject(git_dir, sha) if sha else None
+            if subject is not None:
+                return f"{sha[:abbrev]} {subject}"
+
+    return _run_git(
+        ["log", "--pretty=oneline", "--abbrev-commit", f"--abbrev={abbrev}", "-1"],
+        dirname,
+    )
+
+
+def git_version(
+    dirname: str, dirty: bool = False, cache: bool = True, abbrev: int = 7
+) -> str:
+    dirname = os.path.abspath(os.path.expanduser(dirname))
+    if not os.path.isdir(dirname):
+        dirname = os.path.dirname(dirname)
+
+    root, git_dir = _find_git_dir(dirname)
+    if not cache or git_dir is None:
+        version = _git_version(dirname, git_dir, abbrev)
+    else:
+        ref, _ = _read_head(git_dir)
+        common_dir = _common_dir(git_dir)
+        paths = [
+            os.path.join(git_dir, "HEAD"),
+            os.path.join(common_dir, "packed-refs"),
+        ]
+        if ref:
+            paths += [os.path.join(common_dir, ref)]
+        signature = (_stat_signature(*paths), abbrev)
+
+        cached = _git_version_cache.get(root)
+        if cached is not None and cached[0] == signature:
+            version = cached[1]
+        else:
+            version = _git_version(dirname, git_dir, abbrev)
+            _git_version_cache[root] = (signature, version)
+
+    if dirty and _run_git(["status", "--porcelain", "--untracked-files=no"], dirname):
+        version += " (dirty)"
+
+    return version
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from carton.cache import DiskCache, memoize
+
+
+def test_memoize(tmp_path):
+    calls = []
+
+    @memoize(tmp_path)
+    def add(x, y=1):
+        calls.append((x, y))
+        return x + y
+
+    assert add(1) == add(1, y=1) == add(x=1) == 2
+    assert add(2) == 3
+    assert calls == [(1, 1), (2, 1)]
+
+
+def test_memoize_files(tmp_path):
+    filename = tmp_path / "data.txt"
+    filename.write_text("a")
+
+    @memoize(tmp_path / "cache", files=["filename"])
+    def read(filename):
+        with open(filename) as f:
+            return f.read()
+
+    assert read(str(filename)) == "a"
+    filename.write_text("bc")
+    assert read(str(filename)) == "bc"
+
+
+def test_unpicklable_result(tmp_path):
+    calls = []
+
+    @memoize(tmp_path)
+    def make_lock(x):
+        calls.append(x)
+        return threading.Lock()
+
+    with pytest.warns(UserWarning):
+        assert make_lock(1) is not None
+    with pytest.warns(UserWarning):
+        make_lock(1)
+
+    assert calls == [1, 1]
+    assert not [x for x in os.listdir(tmp_path) if x.endswith(".tmp")]
+
+
+_KEY_SCRIPT = """
+import sys
+from carton.cache import memoize
+
+@memoize(sys.argv[1])
+def f(x, y):
+    return x
+
+print(f.cache_key({"a", "b", "c", "d"}, frozenset(["x", "y", "z"])))
+"""
+
+
+def test_cache_key_is_stable_for_sets(tmp_path):
+    keys = set()
+    for seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        output = subprocess.run(
+            [sys.executable, "-c", _KEY_SCRIPT, str(tmp_path)],
+            env=env,
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        keys.add(output.strip())
+
+    assert len(keys) == 1
+
+
+def test_max_size_with_instance(tmp_path):
+    with pytest.raises(ValueError):
+        memoize(DiskCache(tmp_path), max_size=1024)
+
+
+def test_eviction(tmp_path):
+    cache = DiskCache(tmp_path, max_size=2500)
+    for i in range(5):
+        cache.set(str(i), b"x" * 1000)
+
+    assert cache.size() <= 2500
+    assert "4" in cache
+    assert "0" not in cache
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from carton.datetime import (
+    ensure_datetime,
+    ensure_datetime64,
+    get_timezone,
+    infer_datetime_format,
+    parse_datetime,
+    parse_datetimes,
+    timestamp10_to_datetime64,
+    timestamp13_to_datetime64,
+    timestamp_to_datetime64,
+)
+
+dateutil_parser = pytest.importorskip("dateutil.parser")
+
+STRINGS = [
+    "2020-01-02 03:04:05",
+    "2020-01-02T03:04:05.123456",
+    "2020/01/02 03:04:05",
+    "2020/01/02 3:04:05",
+    "20200102 03:04:05",
+    "20200102030405",
+    "202001020304",
+    "20200102",
+    "2020-01-02",
+]
+
+
+@pytest.mark.parametrize("string", STRINGS)
+def test_parse_datetime_matches_dateutil(string):
+    assert parse_datetime(string) == dateutil_parser.parse(string)
+
+
+def test_parse_datetime_log_format():
+    tz = datetime.timezone(-datetime.timedelta(hours=7))
+    assert parse_datetime("10/Oct/2000:13:55:36 -0700") == datetime.datetime(
+        2000, 10, 10, 13, 55, 36, tzinfo=tz
+    )
+
+
+def test_parse_datetime_does_not_depend_on_history():
+    parse_datetime.cache_clear()
+    assert parse_datetime("20200102030405") == datetime.datetime(2020, 1, 2, 3, 4, 5)
+    assert ensure_datetime("202001020304") == datetime.datetime(2020, 1, 2, 3, 4)
+
+
+def test_infer_datetime_format_requires_round_trip():
+    assert infer_datetime_format(["", "2020/01/02 03:04:05"]) == "%Y/%m/%d %H:%M:%S"
+    assert infer_datetime_format(["202001020304"]) is None
+
+
+def test_parse_datetimes_falls_back_per_string():
+    strings = [
+        "2020/01/02 03:04:05",
+        "2020/01/03 03:04:05",
+        "2020-01-04",
+        "202001020304",
+    ]
+    assert parse_datetimes(strings) == [dateutil_parser.parse(x) for x in strings]
+
+
+np = pytest.importorskip("numpy")
+
+
+def _expected(timestamps_s, tz):
+    return np.array(
+        [
+            datetime.datetime.fromtimestamp(x, tz).replace(tzinfo=None)
+            for x in timestamps_s
+        ],
+        dtype="datetime64[ms]",
+    )
+
+
+@pytest.mark.parametrize(
+    "timezone", [None, "UTC", "Asia/Shanghai", "America/New_York"]
+)
+def test_timestamp_to_datetime64_single_value(timezone):
+    tz = get_timezone(timezone)
+    actual = timestamp_to_datetime64([1600000000], timezone=timezone)
+    np.testing.assert_array_equal(actual, _expected([1600000000], tz))
+
+
+def test_timestamp_to_datetime64_same_bucket():
+    timestamps = np.arange(1600000000000, 1600000000000 + 60_000, 1000)
+    tz = get_timezone("Europe/Berlin")
+    np.testing.assert_array_equal(
+        timestamp13_to_datetime64(timestamps, timezone="Europe/Berlin"),
+        _expected(timestamps / 1000, tz),
+    )
+
+
+def test_timestamp_to_datetime64_dst_transition():
+    # 2023-11-05 06:00 UTC, when New York falls back from EDT to EST.
+    timestamps = np.arange(1699164000 - 7200, 1699164000 + 7200, 60)
+    tz = get_timezone("America/New_York")
+    np.testing.assert_array_equal(
+        timestamp10_to_datetime64(timestamps, timezone=tz),
+        _expected(timestamps, tz),
+    )
+
+
+def test_timestamp_to_datetime64_detects_unit():
+    np.testing.assert_array_equal(
+        timestamp_to_datetime64([1600000000], timezone="UTC"),
+        timestamp_to_datetime64([1600000000000], timezone="UTC"),
+    )
+
+
+def test_numeric_strings():
+    expected = np.array(["2020-09-13T12:26:40"], dtype="datetime64[ms]")
+    for values in (["1600000000"], ["1600000000000"]):
+        np.testing.assert_array_equal(
+            timestamp_to_datetime64(values, timezone="UTC"), expected
+        )
+        np.testing.assert_array_equal(
+            ensure_datetime64(values, timezone="UTC"), expected
+        )
+
+
+def test_ensure_datetime64_strings():
+    np.testing.assert_array_equal(
+        ensure_datetime64(["2020-01-02T03:04", "20200103"]),
+        np.array(["2020-01-02T03:04", "2020-01-03"], dtype="datetime64[ms]"),
+    )
+    np.testing.assert_array_equal(
+        ensure_datetime64(["2020-01-01T10:00:00+08:00"], timezone="Asia/Tokyo"),
+        np.array(["2020-01-01T11:00"], dtype="datetime64[ms]"),
+    )
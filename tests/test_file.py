@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from carton.file import (
+    dedup_file,
+    iter_file_groups,
+    join_paths,
+    map_file_groups,
+    map_lines,
+    map_records,
+    normalize_path,
+    normalize_paths,
+    path,
+    sort_file,
+)
+
+
+def _touch(root, *names):
+    for name in names:
+        filename = root / name
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_text("")
+
+
+def test_path():
+    p = path("/data") / "dir" / "file.tar.gz"
+    assert p == os.path.join("/data", "dir", "file.tar.gz")
+    assert isinstance(p, str)
+    assert p.stem == "file.tar"
+    assert p.ext == ".gz"
+    assert path("/data/./dir/../file").norm() == os.path.abspath("/data/file")
+    assert path("file").norm() == os.path.abspath("file")
+
+
+def test_join_paths():
+    assert join_paths("/data", ["a", "b.txt"]) == ["/data/a", "/data/b.txt"]
+    assert join_paths("/data", []) == []
+
+
+def test_normalize_paths(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert normalize_paths(["~/a", "/x/../y", "b"]) == [
+        str(tmp_path / "a"),
+        "/y",
+        os.path.abspath("b"),
+    ]
+    assert normalize_path("~/a") == str(tmp_path / "a")
+
+
+def test_iter_file_groups(tmp_path):
+    _touch(tmp_path, "a.x", "a.y", "a-b.x", "a-b.y", "d/c.x", "d/c.y", "e.txt")
+
+    groups = list(iter_file_groups(str(tmp_path), ["x", ".y"], with_key=True))
+    assert [key for key, _ in groups] == ["a-b", "a", os.path.join("d", "c")]
+    assert groups[1][1] == [str(tmp_path / "a.x"), str(tmp_path / "a.y")]
+
+
+def test_iter_file_groups_missing(tmp_path):
+    _touch(tmp_path, "a.x", "a.y", "b.x")
+
+    with pytest.raises(RuntimeError):
+        list(iter_file_groups(str(tmp_path), ["x", "y"]))
+    assert list(iter_file_groups(str(tmp_path), ["x", "y"], missing="ignore")) == [
+        [str(tmp_path / "a.x"), str(tmp_path / "a.y")],
+        [str(tmp_path / "b.x")],
+    ]
+    with pytest.raises(ValueError):
+        list(iter_file_groups(str(tmp_path), ["x", "y"], missing="skip"))
+
+
+@pytest.fixture
+def lines_file(tmp_path):
+    filename = tmp_path / "lines.txt"
+    filename.write_text("".join(f"line {i}\n" for i in range(1000)))
+    return str(filename)
+
+
+@pytest.mark.parametrize("backend", ["serial", "thread", "process"])
+def test_map_lines(lines_file, backend):
+    lines = list(map_lines(lines_file, str.strip, num_workers=3, backend=backend))
+    assert lines == [f"line {i}" for i in range(1000)]
+
+
+@pytest.mark.skipif(not hasattr(os, "pread"), reason="requires os.pread")
+def test_map_lines_short_pread(lines_file, monkeypatch):
+    pread = os.pread
+
+    def short_pread(fd, n, offset):
+        return pread(fd, min(n, 7), offset)
+
+    monkeypatch.setattr(os, "pread", short_pread)
+    lines = list(map_lines(lines_file, str.strip, num_workers=3, backend="thread"))
+    assert lines == [f"line {i}" for i in range(1000)]
+
+
+def _random_line(line):
+    return line.strip(), random.random()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 4])
+def test_map_lines_seed(lines_file, num_workers):
+    def run(num_workers, backend):
+        return list(
+            map_lines(
+                lines_file,
+                _random_line,
+                num_workers=num_workers,
+                chunk_size=2048,
+                backend=backend,
+                seed=42,
+            )
+        )
+
+    expected = run(1, "serial")
+    assert run(num_workers, "process") == expected
+    assert len({x for _, x in expected}) == len(expected)
+
+
+def test_map_lines_seed_thread(lines_file):
+    with pytest.raises(ValueError):
+        map_lines(lines_file, str.strip, num_workers=2, backend="thread", seed=42)
+
+
+def _write_csv(filename, rows, **fmtparams):
+    with open(filename, mode="w", newline="") as f:
+        csv.writer(f, **fmtparams).writerows(rows)
+
+
+@pytest.mark.parametrize("quotechar", ['"', "'"])
+def test_map_records_csv(tmp_path, quotechar):
+    filename = tmp_path / "data.csv"
+    rows = [[str(i), f"multi\nline {i}", f"{quotechar} and , {i}"] for i in range(300)]
+    _write_csv(
+        filename, [["a", "b", "c"]] + rows, quotechar=quotechar, quoting=csv.QUOTE_ALL
+    )
+
+    records = map_records(
+        filename,
+        dict,
+        format="csv",
+        num_workers=3,
+        chunk_size=512,
+        backend="serial",
+        quotechar=quotechar,
+    )
+    assert list(records) == [dict(zip("abc", row)) for row in rows]
+
+
+def test_map_records_csv_escapechar(tmp_path):
+    filename = tmp_path / "data.csv"
+    _write_csv(filename, [["a"], ["1"]])
+
+    for fmtparams in ({"escapechar": "\\"}, {"doublequote": False}):
+        with pytest.raises(ValueError):
+            map_records(filename, dict, format="csv", **fmtparams)
+
+
+def test_map_lines_seed_serial_keeps_state(lines_file):
+    random.seed(0)
+    expected = [random.random() for _ in range(3)]
+
+    random.seed(0)
+    list(map_lines(lines_file, _random_line, backend="serial", seed=42))
+    assert [random.random() for _ in range(3)] == expected
+
+
+def _group_names(group):
+    return [os.path.basename(x) for x in group]
+
+
+@pytest.fixture
+def groups_dir(tmp_path):
+    _touch(tmp_path, "z.x", "z.y", "a/x.x", "a/x.y", "a-b.x", "a-b.y", "m.x", "m.y")
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("backend", ["serial", "thread", "process"])
+def test_map_file_groups(groups_dir, backend):
+    results = list(
+        map_file_groups(groups_dir, ["x", "y"], _group_names, 2, backend=backend)
+    )
+    expected = [
+        (key, [os.path.basename(x) for x in group])
+        for key, group in iter_file_groups(groups_dir, ["x", "y"], with_key=True)
+    ]
+    assert results == expected
+    assert [key for key, _ in results] == ["a-b", os.path.join("a", "x"), "m", "z"]
+
+
+def _sleep_by_key(group):
+    # Earlier groups finish later, so unordered results come out reversed.
+    delay = {"a-b": 0.3, "m": 0.2, "z": 0.1}
+    time.sleep(delay[os.path.splitext(os.path.basename(group[0]))[0]])
+    return len(group)
+
+
+def test_map_file_groups_unordered(tmp_path):
+    _touch(tmp_path, "a-b.x", "m.x", "z.x")
+    kwargs = {"num_workers": 3, "backend": "thread", "prefetch": 3}
+
+    ordered = map_file_groups(str(tmp_path), "x", _sleep_by_key, **kwargs)
+    assert [key for key, _ in ordered] == ["a-b", "m", "z"]
+
+    unordered = map_file_groups(
+        str(tmp_path), "x", _sleep_by_key, ordered=False, **kwargs
+    )
+    assert [key for key, _ in unordered] == ["z", "m", "a-b"]
+
+
+def test_map_file_groups_missing(tmp_path):
+    _touch(tmp_path, "a.x", "a.y", "b.x")
+
+    with pytest.raises(RuntimeError):
+        list(map_file_groups(str(tmp_path), ["x", "y"], len, backend="serial"))
+
+    results = map_file_groups(
+        str(tmp_path), ["x", "y"], len, backend="serial", missing="ignore"
+    )
+    assert list(results) == [("a", 2), ("b", 1)]
+
+    with pytest.raises(ValueError):
+        list(map_file_groups(str(tmp_path), "x", len, missing="skip"))
+
+
+def test_map_file_groups_close_cancels_pending(tmp_path):
+    _touch(tmp_path, *[f"{i:02d}.x" for i in range(20)])
+    calls = []
+    lock = threading.Lock()
+
+    def fn(group):
+        with lock:
+            calls.append(group)
+        time.sleep(0.05)
+        return group
+
+    results = map_file_groups(
+        str(tmp_path), "x", fn, num_workers=1, backend="thread", prefetch=4
+    )
+    assert next(results)[0] == "00"
+    results.close()
+
+    assert len(calls) <= 3
+
+
+@pytest.fixture
+def words_file(tmp_path):
+    rng = random.Random(0)
+    lines = [f"{rng.randrange(500)} {rng.choice('abc')}\n" for _ in range(5000)]
+    filename = tmp_path / "words.txt"
+    filename.write_text("".join(lines))
+    return str(filename), lines
+
+
+def _read(filename):
+    with open(filename) as f:
+        return f.readlines()
+
+
+def _first_word(line):
+    return int(line.split()[0])
+
+
+@pytest.mark.parametrize("backend", ["serial", "process"])
+def test_sort_file(words_file, tmp_path, backend):
+    filename, lines = words_file
+    output = str(tmp_path / "sorted.txt")
+
+    kwargs = {"num_workers": 2, "chunk_size": 4096, "backend": backend}
+    sort_file(filename, output, **kwargs)
+    assert _read(output) == sorted(lines)
+
+    sort_file(filename, output, unique=True, reverse=True, **kwargs)
+    assert _read(output) == sorted(set(lines), reverse=True)
+
+    sort_file(filename, output, key=_first_word, unique=True, **kwargs)
+    assert [_first_word(x) for x in _read(output)] == sorted(
+        {_first_word(x) for x in lines}
+    )
+
+
+def test_sort_file_multi_round_merge(words_file, tmp_path):
+    filename, lines = words_file
+    output = str(tmp_path / "sorted.txt")
+
+    sort_file(filename, output, chunk_size=1024, max_runs=2, backend="serial")
+    assert _read(output) == sorted(lines)
+
+
+def test_sort_and_dedup_edge_files(tmp_path):
+    filename = tmp_path / "input.txt"
+    output = str(tmp_path / "output.txt")
+
+    filename.write_text("b\na\nb")
+    sort_file(filename, output, backend="serial")
+    assert _read(output) == ["a\n", "b\n", "b\n"]
+    dedup_file(filename, output, backend="serial")
+    assert _read(output) == ["b\n", "a\n"]
+
+    filename.write_text("")
+    sort_file(filename, output, backend="serial")
+    assert _read(output) == []
+    dedup_file(filename, output, backend="serial")
+    assert _read(output) == []
+
+
+@pytest.mark.parametrize("backend", ["serial", "process"])
+def test_dedup_file(words_file, tmp_path, backend):
+    filename, lines = words_file
+    output = str(tmp_path / "dedup.txt")
+
+    kwargs = {"num_workers": 2, "chunk_size": 4096, "backend": backend}
+    dedup_file(filename, output, num_partitions=8, **kwargs)
+    assert _read(output) == list(dict.fromkeys(lines))
+
+    dedup_file(filename, output, key=_first_word, num_partitions=8, **kwargs)
+    expected = {}
+    for line in lines:
+        expected.setdefault(_first_word(line), line)
+    assert _read(output) == list(expected.values())
+
+
+@pytest.mark.parametrize("backend", ["serial", "process"])
+def test_map_records_jsonl(tmp_path, backend):
+    filename = tmp_path / "data.jsonl"
+    records = [{"id": i, "text": f"ünïcode {i}", "tags": ["a", i]} for i in range(500)]
+    filename.write_text(
+        "".join(json.dumps(x, ensure_ascii=False) + "\n\n" for x in records),
+        encoding="utf-8",
+    )
+
+    results = map_records(
+        filename, dict, format="jsonl", num_workers=3, chunk_size=1024, backend=backend
+    )
+    assert list(results) == records
+
+
+@pytest.mark.parametrize("backend", ["serial", "process"])
+def test_map_records_fixed(tmp_path, backend):
+    filename = tmp_path / "data.bin"
+    filename.write_bytes(b"".join(i.to_bytes(4, "little") for i in range(1000)))
+
+    results = map_records(
+        filename,
+        _from_bytes,
+        format="fixed",
+        record_size=4,
+        num_workers=3,
+        chunk_size=1001,
+        backend=backend,
+    )
+    assert list(results) == list(range(1000))
+
+
+def _from_bytes(data):
+    return int.from_bytes(data, "little")
+
+
+def test_map_records_fixed_errors(tmp_path):
+    filename = tmp_path / "data.bin"
+    filename.write_bytes(b"\0" * 10)
+
+    with pytest.raises(ValueError):
+        map_records(filename, bytes, format="fixed", record_size=4)
+    with pytest.raises(ValueError):
+        map_records(filename, bytes, format="fixed")
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("plotly")
+pytest.importorskip("streamlit")
+
+# pylint: disable=wrong-import-position
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+
+def _app(prediction_file, df_score):
+    from carton.gallary import display_clustering
+
+    display_clustering([prediction_file], df_score)
+
+
+def test_display_clustering_single_row(tmp_path):
+    prediction_file = tmp_path / "predictions.csv"
+    pd.DataFrame({"text": ["a", "b", "c"], "prediction": [0, 1, 1]}).to_csv(
+        prediction_file, index=False
+    )
+    df_score = pd.DataFrame({"k": [3, 1, 2], "score": [0.3, 0.1, 0.2]})
+
+    at = AppTest.from_function(
+        _app, args=(str(prediction_file), df_score), default_timeout=30
+    )
+    at.run()
+
+    assert not at.exception
+    assert len(at.table) == 1
+
+
+def test_downsample_unsorted():
+    from carton.gallary import _downsample
+
+    df_score = pd.DataFrame({"k": range(100)[::-1], "score": range(100)})
+    x, y = _downsample(df_score, "k", "score", 10)
+
+    assert len(x) == 10
+    assert x.is_monotonic_increasing
+    assert (x.iloc[0], x.iloc[-1]) == (0, 99)
+    assert list(y) == [99 - k for k in x]
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative `-X importtime` budget in microseconds.
+BUDGET = 100_000
+
+HEAVY_MODULES = [
+    "numpy",
+    "dateutil",
+    "ruyaml",
+    "pytoml",
+    "pandas",
+    "plotly",
+    "streamlit",
+    "torch",
+]
+
+
+def _import(module):
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        if name.strip() == module:
+            cumulative = int(cumulative_us)
+
+    return cumulative, json.loads(proc.stdout)
+
+
+@pytest.mark.parametrize("module", ["carton", "carton.file"])
+def test_import_time(module):
+    cumulative, heavy = _import(module)
+
+    assert cumulative is not None
+    assert cumulative < BUDGET
+    assert heavy == []
+
+
+def test_submodules_are_lazy():
+    import carton
+
+    assert "gallary" in carton.__all__
+    assert carton.io.__name__ == "carton.io"
+    with pytest.raises(AttributeError):
+        carton.missing  # pylint: disable=pointless-statement
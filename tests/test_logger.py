@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from carton.file import map_lines
+from carton.logger import _QueueHandler, log_dict, setup_logger
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self, event=None):
+        super().__init__()
+        self.records = []
+        self.event = event
+
+    def emit(self, record):
+        if self.event is not None:
+            self.event.wait()
+        self.records.append(record)
+
+
+def _queue_logger(name, filename):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    setup_logger(logger, filename=filename, stream=False, queue=True)
+
+    return logger
+
+
+def _read(filename):
+    with open(filename) as f:
+        return f.read().splitlines()
+
+
+def test_log_dict_snapshots_data():
+    logger = logging.getLogger("carton.tests.log_dict")
+    logger.setLevel(logging.INFO)
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    try:
+        d = {"step": 1}
+        log_dict(logger, d)
+        d["step"] = 2
+    finally:
+        logger.removeHandler(handler)
+
+    (record,) = handler.records
+    assert record.data == {"step": 1}
+    assert record.getMessage() == "step = 1"
+
+
+def test_queue_handler_flushes_on_close(tmp_path):
+    filename = str(tmp_path / "log.txt")
+    logger = _queue_logger("carton.tests.queue_close", filename)
+    for i in range(1000):
+        logger.info("record %d", i)
+
+    logger.handlers[0].close()
+    lines = _read(filename)
+    assert len(lines) == 1000
+    assert lines[-1].endswith("record 999")
+
+
+def test_queue_handler_drops_and_reports():
+    event = threading.Event()
+    target = _ListHandler(event)
+    handler = _QueueHandler([target], maxsize=1, block=False)
+    logger = logging.getLogger("carton.tests.queue_drop")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(10):
+            logger.warning("record %d", i)
+        assert handler.dropped > 0
+        dropped = handler.dropped
+    finally:
+        event.set()
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert len(target.records) == 10 - dropped + 1
+    assert target.records[-1].getMessage() == (
+        f"Dropped {dropped} log records because the queue was full"
+    )
+
+
+def test_setup_logger_closes_previous_listener(tmp_path):
+    logger = _queue_logger("carton.tests.queue_reset", str(tmp_path / "a.txt"))
+    # pylint: disable=protected-access
+    thread = logger.handlers[0].listener._thread
+
+    _queue_logger("carton.tests.queue_reset", str(tmp_path / "b.txt"))
+    try:
+        assert not thread.is_alive()
+    finally:
+        logger.handlers[0].close()
+
+
+def _log_line(line):
+    logging.getLogger("carton.tests.queue_workers").info("line %s", line.strip())
+    return line
+
+
+def test_queue_handler_in_process_workers(tmp_path):
+    lines_file = tmp_path / "lines.txt"
+    lines_file.write_text("".join(f"{i}\n" for i in range(2000)))
+    filename = str(tmp_path / "log.txt")
+    logger = _queue_logger("carton.tests.queue_workers", filename)
+    try:
+        list(map_lines(lines_file, _log_line, num_workers=4, backend="process"))
+    finally:
+        logger.handlers[0].close()
+
+    assert sorted(int(x.rsplit(" ", 1)[1]) for x in _read(filename)) == list(
+        range(2000)
+    )
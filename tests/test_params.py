@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import pytest
+
+from carton import params
+from carton.params import Params
+
+pytest.importorskip("ruyaml")
+
+
+@pytest.fixture
+def yaml_file(tmp_path):
+    filename = tmp_path / "config.yaml"
+    filename.write_text("flag: yes\nmode: 0755\non: off\nnested: {a: [1, 2]}\n")
+
+    return str(filename)
+
+
+def test_from_yaml_is_yaml12(yaml_file):
+    assert Params.from_yaml(yaml_file) == {
+        "flag": "yes",
+        "mode": 755,
+        "on": "off",
+        "nested": {"a": [1, 2]},
+    }
+
+
+def test_from_yaml_cache_returns_copies(yaml_file, tmp_path):
+    first = Params.from_yaml(yaml_file, cache=tmp_path / "cache")
+    first["nested"]["a"].append(3)
+
+    params.clear_cache()
+    assert Params.from_yaml(yaml_file, cache=tmp_path / "cache") == Params.from_yaml(
+        yaml_file
+    )
+
+
+def test_cache_is_keyed_by_loader(yaml_file, tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    assert Params.from_yaml(yaml_file, cache=cache)["flag"] == "yes"
+
+    monkeypatch.setitem(params._LOADERS, "yaml", lambda text, **kwargs: {"x": 1})
+    assert Params.from_yaml(yaml_file, cache=cache) == {"x": 1}
+
+
+def test_from_json_and_toml(tmp_path):
+    config = Params({"a": 1, "b": {"c": "x"}})
+    config.to_json(str(tmp_path / "c.json"))
+    assert Params.from_json(str(tmp_path / "c.json")) == config
+
+    (tmp_path / "c.toml").write_text('a = 1\n[b]\nc = "x"\n')
+    assert Params.from_toml(str(tmp_path / "c.toml")) == config
+
+
+def test_from_json_falls_back_to_json():
+    config = Params.from_json_string(
+        '{"a": NaN, "b": 123456789012345678901234567890, "c": Infinity}'
+    )
+    assert config["a"] != config["a"]
+    assert config["b"] == 123456789012345678901234567890
+    assert config["c"] == float("inf")
+
+
+def test_from_toml_kwargs(tmp_path):
+    pytest.importorskip("pytoml")
+    (tmp_path / "c.toml").write_text('a = 1\n[b]\nc = "x"\n')
+
+    class Table(dict):
+        pass
+
+    config = Params.from_toml(str(tmp_path / "c.toml"), object_pairs_hook=Table)
+    assert config == {"a": 1, "b": {"c": "x"}}
+    assert isinstance(config["b"], Table)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from carton import profiling
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    profiling.reset()
+    yield
+    profiling.reset()
+    profiling.set_max_samples(10000)
+
+
+def test_record_is_bounded():
+    profiling.set_max_samples(100)
+    for i in range(1, 10001):
+        profiling.record("f", i * 1000)
+
+    assert len(profiling.timings(unit="us")["f"]) == 100
+
+
+def test_summary_uses_exact_count_and_total():
+    pytest.importorskip("numpy")
+    profiling.set_max_samples(10)
+    for i in range(1, 1001):
+        profiling.record("f", i * 1_000_000)
+
+    info = profiling.summary(unit="ms")["f"]
+    assert info["size"] == 1000
+    assert info["total"] == 500500
+    assert info["mean"] == 500.5
+    assert info["min"] == 1
+    assert info["max"] == 1000
+
+
+def test_timer_records():
+    with profiling.timer("block") as t:
+        pass
+    assert t.elapsed_ns > 0
+    assert len(profiling.timings()["block"]) == 1
+
+
+def test_invalid_unit():
+    with pytest.raises(ValueError):
+        profiling.timings(unit="min")
+
+
+def test_record_keeps_global_random_state():
+    profiling.set_max_samples(2)
+
+    random.seed(0)
+    expected = [random.random() for _ in range(10)]
+
+    random.seed(0)
+    actual = []
+    for _ in range(10):
+        with profiling.timer("block"):
+            actual.append(random.random())
+
+    assert actual == expected
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import collections
+import random
+
+import pytest
+
+from carton.random import (
+    derive_seed,
+    get_state,
+    random_strings,
+    reservoir_sample,
+    seed_all,
+    set_seed,
+    set_state,
+    spawn_seeds,
+    weighted_reservoir_sample,
+)
+
+
+def test_seed_all_restores_state():
+    np = pytest.importorskip("numpy")
+    states = get_state()
+    expected = (random.random(), np.random.random())
+    set_state(states)
+
+    with seed_all(42):
+        first = (random.random(), np.random.random())
+    with seed_all(42):
+        assert (random.random(), np.random.random()) == first
+
+    assert (random.random(), np.random.random()) == expected
+
+
+def test_derived_seeds():
+    pytest.importorskip("numpy")
+    assert derive_seed(42, 1) == derive_seed(42, 1)
+    assert derive_seed(42, 1) != derive_seed(42, 2)
+    assert len(set(spawn_seeds(42, 8))) == 8
+
+
+def test_random_strings():
+    strings = random_strings(5, length=8, chars="ab")
+    assert isinstance(strings, list)
+    assert len(strings) == 5
+    assert all(len(x) == 8 and set(x) <= {"a", "b"} for x in strings)
+
+
+def test_random_strings_array():
+    pytest.importorskip("numpy")
+    strings = random_strings(5, length=4, as_array=True)
+    assert strings.shape == (5,)
+    assert strings.dtype.kind == "U"
+    assert all(len(x) == 4 for x in strings)
+
+
+def test_random_strings_empty():
+    assert random_strings(3, length=0) == ["", "", ""]
+
+
+def test_random_strings_non_ascii():
+    chars = "日本語😀é"
+    strings = random_strings(20, length=6, chars=chars)
+    assert all(len(x) == 6 and set(x) <= set(chars) for x in strings)
+
+
+def test_random_strings_seeded():
+    states = get_state()
+    try:
+        set_seed(7)
+        first = random_strings(4)
+        set_seed(7)
+        assert random_strings(4) == first
+    finally:
+        set_state(states)
+
+
+@pytest.mark.parametrize("sample", [reservoir_sample, weighted_reservoir_sample])
+def test_reservoir_sample_edge_cases(sample):
+    kwargs = {"weight": lambda x: 1} if sample is weighted_reservoir_sample else {}
+    assert sample(range(10), 0, **kwargs) == []
+    assert sample(range(10), -1, **kwargs) == []
+    assert sorted(sample(range(3), 5, **kwargs)) == [0, 1, 2]
+    assert len(sample(range(100), 5, **kwargs)) == 5
+
+
+def test_reservoir_sample_is_uniform():
+    rng = random.Random(0)
+    counts = collections.Counter()
+    for _ in range(10000):
+        counts.update(reservoir_sample(range(10), 3, rng=rng))
+
+    assert set(counts) == set(range(10))
+    assert all(2700 < x < 3300 for x in counts.values())
+
+
+def test_weighted_reservoir_sample_is_proportional():
+    rng = random.Random(0)
+    counts = collections.Counter()
+    for _ in range(10000):
+        counts.update(weighted_reservoir_sample([1, 2, 3, 4], 1, float, rng=rng))
+
+    for item in (1, 2, 3, 4):
+        assert abs(counts[item] - 1000 * item) < 200
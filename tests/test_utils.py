@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+
+import pytest
+
+from carton.utils import git_version
+
+
+def _git(*args, cwd):
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout.strip()
+
+
+def _commit(root, message):
+    _git("init", "-q", cwd=root)
+    (root / "a.txt").write_text("a")
+    _git("add", "a.txt", cwd=root)
+    _git(
+        "-c",
+        "user.name=test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "-q",
+        "--cleanup=verbatim",
+        "-m",
+        message,
+        cwd=root,
+    )
+
+
+@pytest.mark.skipif(not shutil.which("git"), reason="requires git")
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Single line",
+        "First line\nsecond line\n\nBody text",
+        "\n\nLeading blank lines  \nand trailing spaces\n\nBody",
+    ],
+)
+def test_git_version_matches_git_log(tmp_path, message):
+    _commit(tmp_path, message)
+
+    expected = _git("log", "--pretty=oneline", "--abbrev-commit", "-1", cwd=tmp_path)
+    assert git_version(str(tmp_path), cache=False) == expected
+
+
+@pytest.mark.skipif(not shutil.which("git"), reason="requires git")
+def test_git_version_abbrev_packed(tmp_path):
+    _commit(tmp_path, "Subject")
+    _git("config", "core.abbrev", "12", cwd=tmp_path)
+    loose = git_version(str(tmp_path), cache=False, abbrev=9)
+
+    _git("gc", "-q", cwd=tmp_path)
+    packed = git_version(str(tmp_path), cache=False, abbrev=9)
+
+    assert loose == packed
+    assert len(packed.split(" ", 1)[0]) == 9